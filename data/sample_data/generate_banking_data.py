@@ -6,9 +6,25 @@ Generates realistic banking data with proper relationships and constraints
 
 import os
 import sys
+import io
+import csv
+import struct
 import random
+import multiprocessing
+from itertools import repeat
+import numpy as np
 import psycopg2
-from faker import Faker
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from faker import Generator
+from faker.providers.address.en_US import Provider as AddressProvider
+from faker.providers.company.en_US import Provider as CompanyProvider
+from faker.providers.date_time.en_US import Provider as DateTimeProvider
+from faker.providers.job.en_US import Provider as JobProvider
+from faker.providers.lorem.en_US import Provider as LoremProvider
+from faker.providers.person.en_US import Provider as PersonProvider
+from faker.providers.phone_number.en_US import Provider as PhoneNumberProvider
+from faker.providers.ssn.en_US import Provider as SsnProvider
 from datetime import datetime, timedelta, date
 import decimal
 from tqdm import tqdm
@@ -17,9 +33,521 @@ import argparse
 # Add the src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-fake = Faker('en_US')
-fake.seed_instance(42)  # For reproducible data
-random.seed(42)
+SEED = 42
+
+# Only the en_US providers the generator calls; Faker('en_US') would load every provider
+fake = Generator()
+for provider in (PersonProvider, AddressProvider, CompanyProvider, DateTimeProvider,
+                 JobProvider, LoremProvider, PhoneNumberProvider, SsnProvider):
+    fake.add_provider(provider)
+fake.seed_instance(SEED)  # For reproducible data
+random.seed(SEED)
+np.random.seed(SEED)
+
+# Faker's en_US word lists, loaded once so names can be drawn in bulk
+FIRST_NAMES = np.array(list(PersonProvider.first_names), dtype=object)
+LAST_NAMES = np.array(list(PersonProvider.last_names), dtype=object)
+CITY_SUFFIXES = np.array(list(AddressProvider.city_suffixes), dtype=object)
+STREET_SUFFIXES = np.array(list(AddressProvider.street_suffixes), dtype=object)
+
+
+def draw_street_addresses(size):
+    """Compose '<number> <name> <suffix>' street addresses from pooled words"""
+    numbers = np.random.randint(100, 10000, size=size)
+    streets = np.random.choice(LAST_NAMES, size=size)
+    suffixes = np.random.choice(STREET_SUFFIXES, size=size)
+    return [f"{num} {street} {suffix}" for num, street, suffix in zip(numbers, streets, suffixes)]
+
+
+def build_rows_shard(shard):
+    """Run a row builder over one index range with a shard-specific seed.
+
+    Seeding from the shard's start index keeps output reproducible no matter
+    which worker process picks the shard up.
+    """
+    builder, refs, start, stop = shard
+    random.seed(SEED + start)
+    np.random.seed(SEED + start)
+    fake.seed_instance(SEED + start)
+    return builder(refs, start, stop)
+
+
+def build_employee_rows(refs, start, stop):
+    """Build employee row tuples for employee numbers start+1..stop (no database access)"""
+    job_titles = [
+        'Branch Manager', 'Assistant Manager', 'Personal Banker', 'Teller',
+        'Loan Officer', 'Customer Service Representative', 'Financial Advisor',
+        'Compliance Officer', 'Operations Specialist', 'IT Specialist',
+        'Marketing Coordinator', 'HR Generalist', 'Accountant', 'Auditor'
+    ]
+
+    # Draw each foreign-key column for the whole range in one call
+    n = stop - start
+    branch_ids = random.choices(refs['branch_ids'], k=n)
+    department_ids = random.choices(refs['department_ids'], k=n)
+    titles = random.choices(job_titles, k=n)
+    first_names = np.random.choice(FIRST_NAMES, size=n)
+    last_names = np.random.choice(LAST_NAMES, size=n)
+
+    rows = []
+    for j, i in enumerate(range(start, stop)):
+        branch_id = branch_ids[j]
+        department_id = department_ids[j]
+        employee_number = f"EMP{i+1:06d}"
+
+        first_name = first_names[j]
+        last_name = last_names[j]
+        email = f"{first_name.lower()}.{last_name.lower()}.{i+1}@bankexample.com"  # Unique by row number
+
+        hire_date = fake.date_between(start_date='-10y', end_date='today')
+        salary = random.randint(35000, 150000)
+        commission_rate = random.uniform(0.0000, 0.0500) if random.random() < 0.3 else 0.0000
+
+        rows.append((
+            branch_id, department_id, employee_number, first_name, last_name,
+            email, fake.phone_number()[:15], hire_date,
+            titles[j], salary, commission_rate
+        ))
+
+    return rows
+
+
+def build_customer_rows(refs, start, stop):
+    """Build customer row tuples for customer numbers start+1..stop (no database access)"""
+    employment_statuses = ['EMPLOYED', 'SELF_EMPLOYED', 'UNEMPLOYED', 'RETIRED', 'STUDENT', 'HOMEMAKER']
+    risk_ratings = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+    kyc_statuses = ['PENDING', 'VERIFIED', 'EXPIRED', 'REJECTED']
+    aml_statuses = ['CLEAR', 'REVIEW', 'SUSPICIOUS', 'BLOCKED']
+
+    # Bind hot-loop callables to locals to avoid repeated attribute lookups
+    randint, uniform, rand = random.randint, random.uniform, random.random
+    phone_gen, postcode_gen = fake.phone_number, fake.postcode
+    dob_gen, ssn_gen, company_gen, job_gen = fake.date_of_birth, fake.ssn, fake.company, fake.job
+    date_between = fake.date_between
+
+    # Draw each foreign-key and status column for the whole range in one call
+    n = stop - start
+    customer_type_ids = random.choices(refs['customer_type_ids'], k=n)
+    segment_ids = random.choices(refs['customer_segment_ids'], k=n)
+    branch_ids = random.choices(refs['branch_ids'], k=n)
+    city_ids = random.choices(refs['city_ids'], k=n)
+    manager_ids = random.choices(refs['employee_ids'], k=n)
+    has_manager = [rand() < 0.7 for _ in range(n)]
+    employment = random.choices(employment_statuses, k=n)
+    risks = random.choices(risk_ratings, k=n)
+    kycs = random.choices(kyc_statuses, k=n)
+    amls = random.choices(aml_statuses, k=n)
+
+    # Names and addresses come from the pooled word lists in one vectorized draw each
+    first_names = np.random.choice(FIRST_NAMES, size=n)
+    last_names = np.random.choice(LAST_NAMES, size=n)
+    street_addresses = draw_street_addresses(n)
+
+    rows = []
+    append = rows.append
+    for j, i in enumerate(range(start, stop)):
+        customer_number = f"CUST{i+1:08d}"
+        customer_type_id = customer_type_ids[j]
+        segment_id = segment_ids[j]
+        relationship_manager_id = manager_ids[j] if has_manager[j] else None
+        primary_branch_id = branch_ids[j]
+
+        first_name = first_names[j][:50]  # Truncate to 50 chars
+        last_name = last_names[j][:50]   # Truncate to 50 chars
+        email = f"{first_name.lower()}.{last_name.lower()}.{i+1}@example.com"  # Unique by row number
+
+        # Generate realistic financial profile
+        annual_income = randint(25000, 500000)
+        credit_score = randint(300, 850)
+        total_relationship_value = randint(1000, 1000000)
+
+        customer_since = date_between(start_date='-20y', end_date='today')
+
+        append((
+            customer_number, customer_type_id, segment_id, relationship_manager_id,
+            primary_branch_id, first_name, last_name, email, phone_gen()[:15],
+            street_addresses[j], city_ids[j], postcode_gen(),
+            dob_gen(minimum_age=18, maximum_age=90), ssn_gen(),
+            annual_income, employment[j], company_gen()[:100],
+            job_gen()[:50], credit_score, customer_since,
+            risks[j], kycs[j], amls[j],
+            total_relationship_value, total_relationship_value * uniform(1.1, 1.5)
+        ))
+
+    return rows
+
+
+def build_account_rows(refs, start, stop):
+    """Build account row tuples for accounts start+1..stop (no database access)"""
+    # Bind hot-loop callables to locals to avoid repeated attribute lookups
+    date_between = fake.date_between
+
+    # Draw each foreign-key column for the whole range in one call
+    n = stop - start
+    customer_ids = random.choices(refs['customer_ids'], k=n)
+    product_ids = random.choices(refs['product_ids'], k=n)
+    branch_ids = random.choices(refs['branch_ids'], k=n)
+    manager_ids = random.choices(refs['employee_ids'], k=n)
+
+    # Draw each numeric column in one vectorized call; tolist() hands the
+    # loop plain Python numbers
+    rng = np.random.default_rng(SEED + start)
+    has_manager = (rng.random(n) < 0.6).tolist()
+    current = rng.uniform(100, 100000, n)
+    available = (current * rng.uniform(0.8, 1.0, n)).tolist()
+    current = current.tolist()
+    pending = rng.uniform(0, 1000, n).tolist()
+    min_balance = rng.uniform(0, 2500, n).tolist()
+    interest_rate = rng.uniform(0.0000, 0.0500, n).tolist()
+    daily_limit = rng.integers(1000, 10000, n, endpoint=True).tolist()
+    monthly_limit = rng.integers(50000, 200000, n, endpoint=True).tolist()
+
+    rows = []
+    append = rows.append
+    for j in range(n):
+        relationship_manager_id = manager_ids[j] if has_manager[j] else None
+
+        # Derive the number from the row index so it is unique without retries
+        account_number = f"{100000000 + start + j:09d}"
+        opened_date = date_between(start_date='-10y', end_date='today')
+
+        append((
+            customer_ids[j], product_ids[j], branch_ids[j], relationship_manager_id,
+            account_number, current[j], available[j],
+            pending[j], min_balance[j],
+            interest_rate[j], opened_date,
+            daily_limit[j], monthly_limit[j]
+        ))
+
+    return rows
+
+
+def build_merchant_rows(refs, start, stop):
+    """Build merchant row tuples for merchant numbers start+1..stop (no database access)"""
+    rand = random.random
+
+    # Draw each column for the whole range in one call
+    n = stop - start
+    mcc_ids = random.choices(refs['mcc_ids'], k=n)
+    city_ids = random.choices(refs['city_ids'], k=n)
+    merchant_names = random.choices(refs['company_pool'], k=n)
+    other_names = random.choices(refs['company_pool'], k=n)
+    addresses = draw_street_addresses(n)
+    zip_codes = random.choices(refs['postcode_pool'], k=n)
+    phones = random.choices(refs['phone_pool'], k=n)
+
+    rows = []
+    append = rows.append
+    for j, i in enumerate(range(start, stop)):
+        merchant_name = merchant_names[j]
+        dba_name = merchant_name if rand() < 0.7 else other_names[j]
+
+        append((
+            mcc_ids[j], merchant_name, dba_name, f"MERCH{i+1:06d}",
+            city_ids[j], addresses[j], zip_codes[j], phones[j]
+        ))
+
+    return rows
+
+
+TRANSACTION_CHANNELS = ('ATM', 'ONLINE', 'MOBILE', 'BRANCH', 'PHONE', 'ACH', 'WIRE', 'CHECK', 'CARD')
+TRANSACTION_STATUSES = ('PENDING', 'POSTED', 'DECLINED', 'REVERSED', 'CANCELLED')
+TRANSACTION_CATEGORIES = ('GROCERIES', 'GAS', 'DINING', 'SHOPPING', 'BILLS', 'ENTERTAINMENT')
+
+# Realistic skew for the categorical columns (same order as above; each sums to 1)
+TRANSACTION_CHANNEL_WEIGHTS = (0.10, 0.20, 0.20, 0.05, 0.02, 0.12, 0.03, 0.06, 0.22)
+TRANSACTION_STATUS_WEIGHTS = (0.05, 0.85, 0.05, 0.03, 0.02)
+TRANSACTION_CATEGORY_WEIGHTS = (0.25, 0.15, 0.20, 0.20, 0.12, 0.08)
+
+
+def build_transaction_rows(refs, start, stop):
+    """Build transaction row tuples for transaction numbers start+1..stop (no database access)"""
+    # Draw each column for the whole range in one vectorized call; tolist()
+    # turns the draws into plain Python values for COPY
+    n = stop - start
+    rng = np.random.default_rng(SEED + start)
+    account_ids = rng.choice(refs['account_ids'], n).tolist()
+    transaction_type_ids = rng.choice(refs['transaction_type_ids'], n).tolist()
+    merchant_draws = rng.choice(refs['merchant_ids'], n).tolist()
+    has_merchant = (rng.random(n) < 0.7).tolist()
+    merchant_ids = [merchant_id if has else None for merchant_id, has in zip(merchant_draws, has_merchant)]
+    amounts = rng.uniform(-5000, 5000, n).round(2)
+    fees = np.where(rng.random(n) < 0.2, rng.uniform(0, 25, n).round(2), 0)
+    totals = (amounts + fees).tolist()
+    originals = np.abs(amounts).tolist()
+    amounts, fees = amounts.tolist(), fees.tolist()
+    running_balances = rng.uniform(100, 50000, n).round(2).tolist()
+    posting_delays = rng.integers(1, 48, n, endpoint=True)
+    txn_categories = rng.choice(TRANSACTION_CATEGORIES, n, p=TRANSACTION_CATEGORY_WEIGHTS).tolist()
+    txn_channels = rng.choice(TRANSACTION_CHANNELS, n, p=TRANSACTION_CHANNEL_WEIGHTS).tolist()
+    city_ids = rng.choice(refs['city_ids'], n).tolist()
+    txn_statuses = rng.choice(TRANSACTION_STATUSES, n, p=TRANSACTION_STATUS_WEIGHTS).tolist()
+    risk_scores = rng.integers(0, 100, n, endpoint=True).tolist()
+    fraud_flags = (rng.random(n) < 0.01).tolist()
+    aml_flags = (rng.random(n) < 0.005).tolist()
+    locations = draw_street_addresses(n)
+    descriptions = random.choices(refs['sentence_pool'], k=n)
+    memos = random.choices(refs['memo_pool'], k=n)
+
+    # Format the identifier columns with one comprehension each rather than per row
+    transaction_numbers = [f"TXN{i+1:010d}" for i in range(start, stop)]
+    reference_numbers = [f"REF{num}" for num in rng.integers(100000, 999999, n, endpoint=True).tolist()]
+    authorization_codes = [f"AUTH{num}" for num in rng.integers(100000, 999999, n, endpoint=True).tolist()]
+    terminal_ids = [f"TERM{num}" for num in rng.integers(1000, 9999, n, endpoint=True).tolist()]
+    batch_ids = [f"BATCH{num}" for num in rng.integers(1000, 9999, n, endpoint=True).tolist()]
+
+    # Transaction timestamps fall uniformly within the last two years. They stay in
+    # numpy and go to binary COPY as PostgreSQL's native offsets from 2000-01-01
+    # (microseconds for timestamps, days for dates), so no datetime objects are built
+    window_start = np.datetime64(datetime.now() - timedelta(days=2 * 365), 's')
+    transaction_times = window_start + rng.integers(0, 2 * 365 * 86400, n).astype('timedelta64[s]')
+    posted_times = transaction_times + posting_delays.astype('timedelta64[h]')
+    transaction_dates = (transaction_times - np.datetime64(PG_EPOCH, 'us')).astype(np.int64).tolist()
+    posted_dates = (posted_times - np.datetime64(PG_EPOCH, 'us')).astype(np.int64).tolist()
+    value_dates = (transaction_times.astype('datetime64[D]') - np.datetime64(PG_EPOCH_DATE, 'D')).astype(np.int64).tolist()
+
+    # Stitch the columns into row tuples in C; constant columns are repeated
+    rows = list(zip(
+        account_ids, transaction_type_ids, merchant_ids, transaction_numbers,
+        reference_numbers, authorization_codes,
+        amounts, fees, totals, running_balances,
+        originals, repeat('USD'), repeat(1.000000), transaction_dates,
+        value_dates, posted_dates,
+        descriptions, memos,
+        txn_categories, txn_channels, terminal_ids,
+        locations, city_ids,
+        txn_statuses, risk_scores,
+        fraud_flags, aml_flags,
+        batch_ids
+    ))
+
+    return rows
+
+
+# Size of the blocks copy_expert pulls from a row stream
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class RowStream(io.RawIOBase):
+    """Read-only file object that CSV-encodes rows from an iterable on demand.
+
+    copy_expert pulls fixed-size blocks through readinto(), so only one block of
+    encoded rows is held in memory at a time and row encoding overlaps with sending.
+    """
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.pending = bytearray()
+        self.finished = False
+        self.text = io.StringIO()
+        self.writer = csv.writer(self.text)
+
+    def readable(self):
+        return True
+
+    def encode(self, row):
+        self.writer.writerow(row)
+        data = self.text.getvalue().encode('utf-8')
+        self.text.seek(0)
+        self.text.truncate()
+        return data
+
+    def finish(self):
+        """Bytes that close the stream once the rows run out"""
+        return b''
+
+    def readinto(self, buffer):
+        pending = self.pending
+        while not self.finished and len(pending) < len(buffer):
+            row = next(self.rows, None)
+            if row is None:
+                pending += self.finish()
+                self.finished = True
+                break
+            pending += self.encode(row)
+        
+        size = min(len(buffer), len(pending))
+        buffer[:size] = pending[:size]
+        del pending[:size]
+        return size
+
+
+# PostgreSQL binary COPY encoders: each returns a value's wire-format bytes.
+# Timestamps and dates are sent as int8 microseconds / int4 days since PG_EPOCH
+PG_EPOCH = datetime(2000, 1, 1)
+PG_EPOCH_DATE = date(2000, 1, 1)
+
+
+def encode_int4(value):
+    return struct.pack('>i', value)
+
+
+def encode_text(value):
+    return value.encode('utf-8')
+
+
+def encode_bool(value):
+    return b'\x01' if value else b'\x00'
+
+
+def encode_int8(value):
+    return struct.pack('>q', value)
+
+
+def numeric_encoder(scale):
+    """Return an encoder for NUMERIC values rounded to `scale` decimal places"""
+    # NUMERIC is sent as base-10000 digits; pad the fraction out to whole digits
+    fraction_digits = (scale + 3) // 4
+    shift = 10 ** (fraction_digits * 4 - scale)
+
+    def encode(value):
+        units = round(abs(value) * 10 ** scale) * shift
+        digits = []
+        while units:
+            units, digit = divmod(units, 10000)
+            digits.append(digit)
+        digits.reverse()
+        weight = len(digits) - fraction_digits - 1 if digits else 0
+        sign = 0x4000 if value < 0 and digits else 0x0000
+        return struct.pack(f'>hhHH{len(digits)}h', len(digits), weight, sign, scale, *digits)
+
+    return encode
+
+
+class BinaryRowStream(RowStream):
+    """Read-only file object that encodes rows in PostgreSQL's binary COPY format on demand.
+
+    Each column has an encoder from above; None is written as NULL.
+    """
+
+    HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+    TRAILER = struct.pack('>h', -1)
+    NULL = struct.pack('>i', -1)
+
+    def __init__(self, rows, encoders):
+        super().__init__(rows)
+        self.encoders = encoders
+        self.field_count = struct.pack('>h', len(encoders))
+        self.pending += self.HEADER
+
+    def encode(self, row):
+        data = bytearray(self.field_count)
+        for value, encode in zip(row, self.encoders):
+            if value is None:
+                data += self.NULL
+            else:
+                field = encode(value)
+                data += struct.pack('>i', len(field))
+                data += field
+        return data
+
+    def finish(self):
+        return self.TRAILER
+
+
+# Fixed reference data, loaded once by BankingDataGenerator.generate_reference_data
+COUNTRIES = [
+    ('USA', 'United States', 'USD', 0.0750),
+    ('CAN', 'Canada', 'CAD', 0.0500),
+    ('GBR', 'United Kingdom', 'GBP', 0.0200),
+    ('DEU', 'Germany', 'EUR', 0.1900),
+    ('FRA', 'France', 'EUR', 0.2000),
+    ('JPN', 'Japan', 'JPY', 0.1000),
+    ('AUS', 'Australia', 'AUD', 0.1000),
+    ('CHE', 'Switzerland', 'CHF', 0.0750),
+    ('NLD', 'Netherlands', 'EUR', 0.2100),
+    ('SWE', 'Sweden', 'SEK', 0.2500),
+]
+
+REGIONS = [
+    ('NORTHEAST', 'Northeast Region', 'John Smith'),
+    ('SOUTHEAST', 'Southeast Region', 'Maria Garcia'),
+    ('MIDWEST', 'Midwest Region', 'Robert Johnson'),
+    ('SOUTHWEST', 'Southwest Region', 'Lisa Wong'),
+    ('WEST', 'West Region', 'David Brown'),
+    ('NORTHWEST', 'Northwest Region', 'Sarah Davis'),
+    ('MOUNTAIN', 'Mountain Region', 'Michael Wilson'),
+    ('CENTRAL', 'Central Region', 'Jennifer Miller')
+]
+
+DEPARTMENTS = [
+    ('RETAIL', 'Retail Banking', 'Consumer banking services'),
+    ('COMMERCIAL', 'Commercial Banking', 'Business banking services'),
+    ('WEALTH', 'Wealth Management', 'Investment and wealth services'),
+    ('LENDING', 'Lending Services', 'Loan and credit services'),
+    ('OPERATIONS', 'Operations', 'Back office operations'),
+    ('COMPLIANCE', 'Compliance', 'Regulatory compliance'),
+    ('IT', 'Information Technology', 'Technology services'),
+    ('HR', 'Human Resources', 'Employee services'),
+    ('MARKETING', 'Marketing', 'Marketing and communications'),
+    ('FINANCE', 'Finance', 'Financial planning and analysis')
+]
+
+CUSTOMER_SEGMENTS = [
+    ('BASIC', 'Basic Banking', 0, 10000, 'Basic banking services', 0),
+    ('PREFERRED', 'Preferred Customer', 10000, 50000, 'Enhanced services and lower fees', 50),
+    ('PREMIUM', 'Premium Banking', 50000, 250000, 'Premium services and dedicated support', 150),
+    ('PRIVATE', 'Private Banking', 250000, 1000000, 'Private banking and wealth management', 500),
+    ('ELITE', 'Elite Banking', 1000000, None, 'Exclusive elite services', 1000)
+]
+
+CUSTOMER_TYPES = [
+    ('INDIVIDUAL', 'Individual Customer', 'Personal banking customer', False, False, 18),
+    ('BUSINESS', 'Business Customer', 'Small business customer', True, True, 18),
+    ('CORPORATE', 'Corporate Customer', 'Large corporate customer', True, True, 21),
+    ('NON_PROFIT', 'Non-Profit Organization', 'Non-profit organization', True, True, 18),
+    ('TRUST', 'Trust Account', 'Trust and estate account', False, False, 18)
+]
+
+PRODUCT_CATEGORIES = [
+    ('CHECKING', 'Checking Accounts', 'DEPOSIT', 'Demand deposit accounts'),
+    ('SAVINGS', 'Savings Accounts', 'DEPOSIT', 'Savings and money market accounts'),
+    ('CD', 'Certificates of Deposit', 'DEPOSIT', 'Time deposit accounts'),
+    ('MORTGAGE', 'Mortgage Loans', 'LOAN', 'Residential mortgage products'),
+    ('AUTO', 'Auto Loans', 'LOAN', 'Vehicle financing'),
+    ('PERSONAL', 'Personal Loans', 'LOAN', 'Unsecured personal loans'),
+    ('CREDIT', 'Credit Cards', 'CARD', 'Credit card products'),
+    ('DEBIT', 'Debit Cards', 'CARD', 'Debit card products'),
+    ('INVESTMENT', 'Investment Products', 'INVESTMENT', 'Investment and brokerage'),
+    ('INSURANCE', 'Insurance Products', 'INSURANCE', 'Banking insurance products')
+]
+
+TRANSACTION_TYPES = [
+    ('DEPOSIT', 'Deposit', 'Cash or check deposit', 'CREDIT', False, False, False),
+    ('WITHDRAWAL', 'Withdrawal', 'Cash withdrawal', 'DEBIT', False, True, False),
+    ('XFER_IN', 'Transfer In', 'Incoming transfer', 'CREDIT', False, False, False),
+    ('XFER_OUT', 'Transfer Out', 'Outgoing transfer', 'DEBIT', False, True, False),
+    ('FEE', 'Fee', 'Bank fee charge', 'DEBIT', False, False, True),
+    ('INTEREST', 'Interest', 'Interest payment', 'CREDIT', False, False, True),
+    ('PURCHASE', 'Purchase', 'Debit card purchase', 'DEBIT', False, False, False),
+    ('ATM', 'ATM Transaction', 'ATM withdrawal or deposit', 'BOTH', False, True, False),
+    ('CHECK', 'Check Payment', 'Check clearing', 'DEBIT', False, False, False),
+    ('ACH_DB', 'ACH Debit', 'Automated clearing house debit', 'DEBIT', False, False, True),
+    ('ACH_CR', 'ACH Credit', 'Automated clearing house credit', 'CREDIT', False, False, True),
+    ('WIRE_IN', 'Wire Transfer In', 'Incoming wire transfer', 'CREDIT', True, True, True),
+    ('WIRE_OUT', 'Wire Transfer Out', 'Outgoing wire transfer', 'DEBIT', True, True, True),
+    ('OVERDRAFT', 'Overdraft Fee', 'Overdraft penalty', 'DEBIT', False, False, True),
+    ('REFUND', 'Refund', 'Transaction refund', 'CREDIT', False, False, False)
+]
+
+MERCHANT_CATEGORIES = [
+    ('5411', 'Grocery Stores', 'Supermarkets and grocery stores', 'LOW'),
+    ('5541', 'Service Stations', 'Gas stations and fuel', 'LOW'),
+    ('5812', 'Eating Places', 'Restaurants and dining', 'LOW'),
+    ('5311', 'Department Stores', 'General merchandise stores', 'LOW'),
+    ('5691', 'Mens and Womens Clothing', 'Apparel and clothing', 'LOW'),
+    ('5732', 'Electronics Stores', 'Consumer electronics', 'MEDIUM'),
+    ('5999', 'Miscellaneous Retail', 'Other retail establishments', 'MEDIUM'),
+    ('6011', 'Financial Institutions', 'Banks and credit unions', 'HIGH'),
+    ('7011', 'Hotels and Motels', 'Lodging establishments', 'MEDIUM'),
+    ('7841', 'Video Entertainment', 'Movie theaters and entertainment', 'LOW'),
+    ('4111', 'Transportation', 'Local and suburban transit', 'LOW'),
+    ('5967', 'Direct Marketing', 'Mail order and online retail', 'MEDIUM'),
+    ('5993', 'Cigar Stores', 'Tobacco products', 'HIGH'),
+    ('7995', 'Gambling', 'Betting and gambling', 'HIGH'),
+    ('6051', 'Quasi Cash', 'Money orders and traveler checks', 'HIGH')
+]
+
 
 class BankingDataGenerator:
     def __init__(self, db_connection):
@@ -38,38 +566,220 @@ class BankingDataGenerator:
         self.customer_type_ids = []
         self.customer_ids = []
         self.product_category_ids = []
+        self.category_code_to_id = {}
         self.product_ids = []
         self.account_ids = []
         self.transaction_type_ids = []
         self.mcc_ids = []
         self.merchant_ids = []
         
-    def generate_countries(self, count=10):
-        """Generate country reference data"""
-        print(f"🌍 Generating {count} countries...")
-        
-        countries_data = [
-            ('USA', 'United States', 'USD', 0.0750),
-            ('CAN', 'Canada', 'CAD', 0.0500),
-            ('GBR', 'United Kingdom', 'GBP', 0.0200),
-            ('DEU', 'Germany', 'EUR', 0.1900),
-            ('FRA', 'France', 'EUR', 0.2000),
-            ('JPN', 'Japan', 'JPY', 0.1000),
-            ('AUS', 'Australia', 'AUD', 0.1000),
-            ('CHE', 'Switzerland', 'CHF', 0.0750),
-            ('NLD', 'Netherlands', 'EUR', 0.2100),
-            ('SWE', 'Sweden', 'SEK', 0.2500),
-        ]
+        # Pools of Faker output for high-volume text columns; rows draw from
+        # these instead of calling Faker once per row
+        self.company_pool = [fake.company()[:100] for _ in range(2000)]
+        self.postcode_pool = [fake.postcode() for _ in range(2000)]
+        self.phone_pool = [fake.phone_number()[:15] for _ in range(2000)]
+        self.sentence_pool = [fake.sentence(nb_words=6) for _ in range(5000)]
+        self.memo_pool = [fake.text(max_nb_chars=50) for _ in range(5000)]
         
-        for code, name, currency, tax_rate in countries_data:
-            self.cursor.execute("""
-                INSERT INTO countries (country_code, country_name, currency_code, tax_rate)
-                VALUES (%s, %s, %s, %s) RETURNING country_id;
-            """, (code, name, currency, tax_rate))
-            self.country_ids.append(self.cursor.fetchone()[0])
+        self.skip_fk_triggers = False
+        self.deferred_indexes = []
+        self.deferred_foreign_keys = []
+        self.worker_pool = None  # Started on first use and shared by every parallel phase
+        self.configure_bulk_load_session()
+        
+    def configure_bulk_load_session(self):
+        """Tune this session for a one-shot bulk load"""
+        # Skipping FK triggers and compressing full-page WAL images need superuser;
+        # the generator only emits ids it has created
+        try:
+            self.cursor.execute("SET session_replication_role = replica;")
+            self.cursor.execute("SET wal_compression = on;")
+            self.skip_fk_triggers = True
+        except psycopg2.Error:
+            self.conn.rollback()
         
+        # Don't wait for the WAL flush on each commit, and give index builds room to sort in memory
+        self.cursor.execute("SET synchronous_commit = off;")
+        self.cursor.execute("SET maintenance_work_mem = '1GB';")
         self.conn.commit()
-        print(f"✅ Created {len(self.country_ids)} countries")
+
+    def restore_session_settings(self):
+        """Re-enable FK triggers once the load is finished (before the final commit)"""
+        if self.skip_fk_triggers:
+            self.cursor.execute("SET session_replication_role = origin;")
+            self.skip_fk_triggers = False
+
+    def pre_load_optimize(self, tables=('employees', 'customers', 'accounts', 'merchants', 'transactions')):
+        """Drop secondary indexes (and transaction FKs) on the bulk-loaded tables until post_load_rebuild"""
+        # Primary key and UNIQUE indexes back constraints and stay in place
+        self.cursor.execute("""
+            SELECT ic.relname, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_class tc ON tc.oid = i.indrelid
+            WHERE tc.relname = ANY(%s)
+              AND pg_table_is_visible(tc.oid)
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid);
+        """, (list(tables),))
+        self.deferred_indexes = self.cursor.fetchall()
+        for index_name, _ in self.deferred_indexes:
+            self.cursor.execute(sql.SQL("DROP INDEX {};").format(sql.Identifier(index_name)))
+        
+        # With FK triggers skipped there is nothing to save by dropping the constraints
+        if not self.skip_fk_triggers:
+            self.cursor.execute("""
+                SELECT conname, pg_get_constraintdef(oid)
+                FROM pg_constraint
+                WHERE conrelid = 'transactions'::regclass AND contype = 'f';
+            """)
+            self.deferred_foreign_keys = self.cursor.fetchall()
+            for constraint_name, _ in self.deferred_foreign_keys:
+                self.cursor.execute(sql.SQL("ALTER TABLE transactions DROP CONSTRAINT {};").format(sql.Identifier(constraint_name)))
+        
+        print(f"⏸️  Deferred {len(self.deferred_indexes)} indexes and {len(self.deferred_foreign_keys)} foreign keys")
+
+    def post_load_rebuild(self):
+        """Recreate the indexes and foreign keys dropped by pre_load_optimize"""
+        # Re-adding a foreign key checks every existing row in one pass
+        for constraint_name, definition in self.deferred_foreign_keys:
+            self.cursor.execute(sql.SQL("ALTER TABLE transactions ADD CONSTRAINT {} {};").format(
+                sql.Identifier(constraint_name), sql.SQL(definition)))
+        
+        for _, definition in tqdm(self.deferred_indexes, desc="Rebuilding indexes"):
+            self.cursor.execute(definition + ";")
+        
+        self.deferred_indexes = []
+        self.deferred_foreign_keys = []
+
+    def reserve_ids(self, table, id_column, count):
+        """Reserve a contiguous block of primary key values from the table's sequence in one round-trip"""
+        if count <= 0:
+            return []
+        
+        # Advance the sequence past the whole block at once instead of returning one row per id;
+        # the generator is the only writer while it loads
+        self.cursor.execute("""
+            SELECT setval(seq, nextval(seq) + %s - 1)
+            FROM pg_get_serial_sequence(%s, %s) AS seq;
+        """, (count, table, id_column))
+        last_id = self.cursor.fetchone()[0]
+        return list(range(last_id - count + 1, last_id + 1))
+
+    def copy_rows(self, table, columns, rows):
+        """Bulk load an iterable of rows with COPY FROM STDIN (None is written as NULL)"""
+        self.cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '')",
+            RowStream(rows), size=COPY_BLOCK_SIZE
+        )
+
+    def copy_rows_binary(self, table, columns, rows):
+        """Bulk load rows with binary COPY; columns are (name, encoder) pairs"""
+        self.cursor.copy_expert(
+            f"COPY {table} ({', '.join(name for name, _ in columns)}) FROM STDIN WITH (FORMAT binary)",
+            BinaryRowStream(rows, [encoder for _, encoder in columns]), size=COPY_BLOCK_SIZE
+        )
+
+    def iter_rows_parallel(self, builder, count, desc, shard_size=500):
+        """Yield rows for indexes 0..count-1, in order, as a process pool builds them"""
+        refs = {
+            'city_ids': self.city_ids,
+            'branch_ids': self.branch_ids,
+            'department_ids': self.department_ids,
+            'employee_ids': self.employee_ids,
+            'customer_segment_ids': self.customer_segment_ids,
+            'customer_type_ids': self.customer_type_ids,
+            'customer_ids': self.customer_ids,
+            'product_ids': self.product_ids,
+            'account_ids': self.account_ids,
+            'transaction_type_ids': self.transaction_type_ids,
+            'mcc_ids': self.mcc_ids,
+            'merchant_ids': self.merchant_ids,
+            'company_pool': self.company_pool,
+            'postcode_pool': self.postcode_pool,
+            'phone_pool': self.phone_pool,
+            'sentence_pool': self.sentence_pool,
+            'memo_pool': self.memo_pool,
+        }
+        shards = [
+            (builder, refs, start, min(start + shard_size, count))
+            for start in range(0, count, shard_size)
+        ]
+        
+        if self.worker_pool is None:
+            self.worker_pool = multiprocessing.Pool(os.cpu_count())
+        
+        for shard_rows in tqdm(self.worker_pool.imap(build_rows_shard, shards), total=len(shards), desc=desc):
+            yield from shard_rows
+
+    def close_worker_pool(self, terminate: bool = False):
+        """Shut down the shared row-building processes (terminate skips pending work)"""
+        if self.worker_pool is not None:
+            if terminate:
+                self.worker_pool.terminate()
+            else:
+                self.worker_pool.close()
+            self.worker_pool.join()
+            self.worker_pool = None
+
+    def generate_reference_data(self):
+        """Load all fixed reference tables in a single round-trip"""
+        print("📚 Generating reference data...")
+        
+        regions = [
+            (region_code, region_name, manager, fake.date_between(start_date='-30y', end_date='-5y'))
+            for region_code, region_name, manager in REGIONS
+        ]
+        
+        # (table, id column, code column, insert columns, rows, id list)
+        tables = [
+            ('countries', 'country_id', 'country_code',
+             ('country_code', 'country_name', 'currency_code', 'tax_rate'),
+             COUNTRIES, self.country_ids),
+            ('regions', 'region_id', 'region_code',
+             ('region_code', 'region_name', 'region_manager', 'established_date'),
+             regions, self.region_ids),
+            ('departments', 'department_id', 'department_code',
+             ('department_code', 'department_name', 'description'),
+             DEPARTMENTS, self.department_ids),
+            ('customer_segments', 'segment_id', 'segment_code',
+             ('segment_code', 'segment_name', 'min_relationship_value',
+              'max_relationship_value', 'benefits_description', 'annual_fee'),
+             CUSTOMER_SEGMENTS, self.customer_segment_ids),
+            ('customer_types', 'customer_type_id', 'type_code',
+             ('type_code', 'type_name', 'description', 'requires_business_license',
+              'requires_ein', 'minimum_age'),
+             CUSTOMER_TYPES, self.customer_type_ids),
+            ('product_categories', 'category_id', 'category_code',
+             ('category_code', 'category_name', 'category_type', 'description'),
+             PRODUCT_CATEGORIES, self.product_category_ids),
+            ('transaction_types', 'transaction_type_id', 'type_code',
+             ('type_code', 'type_name', 'description', 'debit_credit',
+              'requires_approval', 'fee_applicable', 'regulatory_reporting'),
+             TRANSACTION_TYPES, self.transaction_type_ids),
+            ('merchant_categories', 'mcc_id', 'mcc_code',
+             ('mcc_code', 'category_name', 'category_description', 'risk_level'),
+             MERCHANT_CATEGORIES, self.mcc_ids),
+        ]
+        
+        # One INSERT per table, closed by a single SELECT that returns every new id with its code
+        statements = []
+        selects = []
+        for table, id_column, code_column, columns, rows, _ in tables:
+            placeholders = f"({', '.join(['%s'] * len(columns))})"
+            values = b', '.join(self.cursor.mogrify(placeholders, row) for row in rows).decode()
+            statements.append(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values};")
+            selects.append(f"SELECT '{table}', {id_column}, {code_column}::text FROM {table}")
+        statements.append("\nUNION ALL\n".join(selects) + "\nORDER BY 1, 2;")
+        self.cursor.execute("\n".join(statements))
+        
+        id_lists = {table: ids for table, *_, ids in tables}
+        for table, row_id, code in self.cursor.fetchall():
+            id_lists[table].append(row_id)
+            if table == 'product_categories':
+                self.category_code_to_id[code] = row_id
+        
+        for table, ids in id_lists.items():
+            print(f"✅ Created {len(ids)} {table.replace('_', ' ')}")
 
     def generate_states(self, count=50):
         """Generate US states and provinces"""
@@ -94,15 +804,17 @@ class BankingDataGenerator:
         # USA is typically the first country
         usa_country_id = self.country_ids[0]
         
-        for state_code, state_name in us_states:
-            tax_rate = round(random.uniform(0.0000, 0.1250), 4)
-            self.cursor.execute("""
-                INSERT INTO states (country_id, state_code, state_name, tax_rate)
-                VALUES (%s, %s, %s, %s) RETURNING state_id;
-            """, (usa_country_id, state_code, state_name, tax_rate))
-            self.state_ids.append(self.cursor.fetchone()[0])
+        rows = [
+            (usa_country_id, state_code, state_name, round(random.uniform(0.0000, 0.1250), 4))
+            for state_code, state_name in us_states
+        ]
+        
+        returned = execute_values(self.cursor, """
+            INSERT INTO states (country_id, state_code, state_name, tax_rate)
+            VALUES %s RETURNING state_id;
+        """, rows, fetch=True)
+        self.state_ids = [r[0] for r in returned]
         
-        self.conn.commit()
         print(f"✅ Created {len(self.state_ids)} states")
 
     def generate_cities(self, count=200):
@@ -122,70 +834,41 @@ class BankingDataGenerator:
             ('Denver', 715000, 62000), ('Washington', 700000, 75000)
         ]
         
-        cities_created = 0
+        rows = []
+        seen = set()  # (state_id, city_name) pairs, unique in the cities table
         
         # Add major cities first
-        for city_name, population, median_income in major_cities:
-            if cities_created >= count:
-                break
-                
+        for city_name, population, median_income in major_cities[:count]:
             state_id = random.choice(self.state_ids)
             zip_code = fake.postcode()
-            
-            self.cursor.execute("""
-                INSERT INTO cities (state_id, city_name, population, median_income, zip_code_primary)
-                VALUES (%s, %s, %s, %s, %s) RETURNING city_id;
-            """, (state_id, city_name, population, median_income, zip_code))
-            self.city_ids.append(self.cursor.fetchone()[0])
-            cities_created += 1
-        
-        # Generate remaining cities
-        for _ in range(count - cities_created):
-            state_id = random.choice(self.state_ids)
-            city_name = fake.city()
-            population = random.randint(10000, 500000)
-            median_income = random.randint(35000, 85000)
-            zip_code = fake.postcode()
-            
-            try:
-                self.cursor.execute("""
-                    INSERT INTO cities (state_id, city_name, population, median_income, zip_code_primary)
-                    VALUES (%s, %s, %s, %s, %s) RETURNING city_id;
-                """, (state_id, city_name, population, median_income, zip_code))
-                self.city_ids.append(self.cursor.fetchone()[0])
-            except psycopg2.IntegrityError:
-                self.conn.rollback()
-                continue  # Skip duplicate city names
-        
-        self.conn.commit()
-        print(f"✅ Created {len(self.city_ids)} cities")
-
-    def generate_regions(self, count=8):
-        """Generate bank regions"""
-        print(f"🏢 Generating {count} regions...")
+            seen.add((state_id, city_name))
+            rows.append((state_id, city_name, population, median_income, zip_code))
         
-        regions = [
-            ('NORTHEAST', 'Northeast Region', 'John Smith'),
-            ('SOUTHEAST', 'Southeast Region', 'Maria Garcia'),
-            ('MIDWEST', 'Midwest Region', 'Robert Johnson'),
-            ('SOUTHWEST', 'Southwest Region', 'Lisa Wong'),
-            ('WEST', 'West Region', 'David Brown'),
-            ('NORTHWEST', 'Northwest Region', 'Sarah Davis'),
-            ('MOUNTAIN', 'Mountain Region', 'Michael Wilson'),
-            ('CENTRAL', 'Central Region', 'Jennifer Miller')
-        ]
+        # Generate remaining cities, named '<surname><suffix>' from the pooled word lists,
+        # drawing again until there are enough names that are unique within their state
+        while len(rows) < count:
+            remaining = count - len(rows)
+            city_names = np.random.choice(LAST_NAMES, size=remaining) + np.random.choice(CITY_SUFFIXES, size=remaining)
+            for city_name in city_names:
+                state_id = random.choice(self.state_ids)
+                if (state_id, city_name) in seen:
+                    continue
+                seen.add((state_id, city_name))
+                
+                population = random.randint(10000, 500000)
+                median_income = random.randint(35000, 85000)
+                zip_code = fake.postcode()
+                rows.append((state_id, city_name, population, median_income, zip_code))
         
-        for region_code, region_name, manager in regions:
-            established_date = fake.date_between(start_date='-30y', end_date='-5y')
-            
-            self.cursor.execute("""
-                INSERT INTO regions (region_code, region_name, region_manager, established_date)
-                VALUES (%s, %s, %s, %s) RETURNING region_id;
-            """, (region_code, region_name, manager, established_date))
-            self.region_ids.append(self.cursor.fetchone()[0])
+        # Send each column as one array parameter so the statement text stays the same size for any count
+        self.cursor.execute("""
+            INSERT INTO cities (state_id, city_name, population, median_income, zip_code_primary)
+            SELECT * FROM unnest(%s::int[], %s::text[], %s::int[], %s::numeric[], %s::text[])
+            RETURNING city_id;
+        """, [list(column) for column in zip(*rows)])
+        self.city_ids.extend(r[0] for r in self.cursor.fetchall())
         
-        self.conn.commit()
-        print(f"✅ Created {len(self.region_ids)} regions")
+        print(f"✅ Created {len(self.city_ids)} cities")
 
     def generate_branches(self, count=150):
         """Generate bank branches"""
@@ -193,239 +876,97 @@ class BankingDataGenerator:
         
         branch_types = ['FULL_SERVICE', 'LIMITED_SERVICE', 'ATM_ONLY', 'COMMERCIAL', 'DRIVE_THRU']
         
+        region_ids = random.choices(self.region_ids, k=count)
+        city_ids = random.choices(self.city_ids, k=count)
+        types = random.choices(branch_types, k=count)
+        
+        rows = []
         for i in range(count):
-            region_id = random.choice(self.region_ids)
-            city_id = random.choice(self.city_ids)
+            region_id = region_ids[i]
+            city_id = city_ids[i]
             branch_code = f"BR{i+1:04d}"
             branch_name = f"{fake.city()} Branch"
             
-            self.cursor.execute("""
-                INSERT INTO branches (
-                    region_id, branch_code, branch_name, city_id,
-                    address_line1, address_line2, zip_code, phone,
-                    manager_name, opened_date, branch_type,
-                    square_footage, employee_count
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING branch_id;
-            """, (
+            rows.append((
                 region_id, branch_code, branch_name, city_id,
                 fake.street_address(), fake.secondary_address() if random.random() < 0.3 else None,
                 fake.postcode(), fake.phone_number()[:15],
                 fake.name(), fake.date_between(start_date='-20y', end_date='-1y'),
-                random.choice(branch_types),
+                types[i],
                 random.randint(2000, 15000), random.randint(5, 50)
             ))
-            self.branch_ids.append(self.cursor.fetchone()[0])
-        
-        self.conn.commit()
-        print(f"✅ Created {len(self.branch_ids)} branches")
-
-    def generate_departments(self):
-        """Generate bank departments"""
-        print("🏢 Generating departments...")
-        
-        departments = [
-            ('RETAIL', 'Retail Banking', 'Consumer banking services'),
-            ('COMMERCIAL', 'Commercial Banking', 'Business banking services'),
-            ('WEALTH', 'Wealth Management', 'Investment and wealth services'),
-            ('LENDING', 'Lending Services', 'Loan and credit services'),
-            ('OPERATIONS', 'Operations', 'Back office operations'),
-            ('COMPLIANCE', 'Compliance', 'Regulatory compliance'),
-            ('IT', 'Information Technology', 'Technology services'),
-            ('HR', 'Human Resources', 'Employee services'),
-            ('MARKETING', 'Marketing', 'Marketing and communications'),
-            ('FINANCE', 'Finance', 'Financial planning and analysis')
-        ]
         
-        for dept_code, dept_name, description in departments:
-            self.cursor.execute("""
-                INSERT INTO departments (department_code, department_name, description)
-                VALUES (%s, %s, %s) RETURNING department_id;
-            """, (dept_code, dept_name, description))
-            self.department_ids.append(self.cursor.fetchone()[0])
+        # Send each column as one array parameter so the statement text stays the same size for any count
+        self.cursor.execute("""
+            INSERT INTO branches (
+                region_id, branch_code, branch_name, city_id,
+                address_line1, address_line2, zip_code, phone,
+                manager_name, opened_date, branch_type,
+                square_footage, employee_count
+            )
+            SELECT * FROM unnest(
+                %s::int[], %s::text[], %s::text[], %s::int[],
+                %s::text[], %s::text[], %s::text[], %s::text[],
+                %s::text[], %s::date[], %s::text[],
+                %s::int[], %s::int[]
+            )
+            RETURNING branch_id;
+        """, [list(column) for column in zip(*rows)])
+        self.branch_ids.extend(r[0] for r in self.cursor.fetchall())
         
-        self.conn.commit()
-        print(f"✅ Created {len(self.department_ids)} departments")
+        print(f"✅ Created {len(self.branch_ids)} branches")
 
     def generate_employees(self, count=800):
         """Generate bank employees"""
         print(f"👥 Generating {count} employees...")
         
-        job_titles = [
-            'Branch Manager', 'Assistant Manager', 'Personal Banker', 'Teller',
-            'Loan Officer', 'Customer Service Representative', 'Financial Advisor',
-            'Compliance Officer', 'Operations Specialist', 'IT Specialist',
-            'Marketing Coordinator', 'HR Generalist', 'Accountant', 'Auditor'
-        ]
+        # Rows are built lazily and streamed straight into COPY
+        employee_ids = self.reserve_ids('employees', 'employee_id', count)
+        rows = self.iter_rows_parallel(build_employee_rows, count, "Creating employees")
         
-        for i in range(count):
-            branch_id = random.choice(self.branch_ids)
-            department_id = random.choice(self.department_ids)
-            employee_number = f"EMP{i+1:06d}"
-
-            first_name = fake.first_name()
-            last_name = fake.last_name()
-            email = fake.unique.email()
-
-            hire_date = fake.date_between(start_date='-10y', end_date='today')
-            salary = random.randint(35000, 150000)
-            commission_rate = random.uniform(0.0000, 0.0500) if random.random() < 0.3 else 0.0000
-            
-            self.cursor.execute("""
-                INSERT INTO employees (
-                    branch_id, department_id, employee_number, first_name, last_name,
-                    email, phone, hire_date, job_title, salary, commission_rate
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING employee_id;
-            """, (
-                branch_id, department_id, employee_number, first_name, last_name,
-                email, fake.phone_number()[:15], hire_date,
-                random.choice(job_titles), salary, commission_rate
-            ))
-            self.employee_ids.append(self.cursor.fetchone()[0])
-        
-        self.conn.commit()
+        self.copy_rows('employees', (
+            'employee_id', 'branch_id', 'department_id', 'employee_number', 'first_name', 'last_name',
+            'email', 'phone', 'hire_date', 'job_title', 'salary', 'commission_rate'
+        ), ((employee_id, *row) for row, employee_id in zip(rows, employee_ids)))
+        self.employee_ids.extend(employee_ids)
         
         # Assign managers (some employees report to other employees)
         print("👨‍💼 Assigning managers...")
+        assignments = {}
         for _ in range(min(200, len(self.employee_ids) // 4)):
             employee_id = random.choice(self.employee_ids)
             manager_id = random.choice(self.employee_ids)
             
             if employee_id != manager_id:
-                self.cursor.execute("""
-                    UPDATE employees SET manager_id = %s WHERE employee_id = %s;
-                """, (manager_id, employee_id))
-        
-        self.conn.commit()
-        print(f"✅ Created {len(self.employee_ids)} employees with management hierarchy")
-
-    def generate_customer_segments(self):
-        """Generate customer segments"""
-        print("💎 Generating customer segments...")
-        
-        segments = [
-            ('BASIC', 'Basic Banking', 0, 10000, 'Basic banking services', 0),
-            ('PREFERRED', 'Preferred Customer', 10000, 50000, 'Enhanced services and lower fees', 50),
-            ('PREMIUM', 'Premium Banking', 50000, 250000, 'Premium services and dedicated support', 150),
-            ('PRIVATE', 'Private Banking', 250000, 1000000, 'Private banking and wealth management', 500),
-            ('ELITE', 'Elite Banking', 1000000, None, 'Exclusive elite services', 1000)
-        ]
-        
-        for code, name, min_val, max_val, benefits, fee in segments:
-            self.cursor.execute("""
-                INSERT INTO customer_segments (
-                    segment_code, segment_name, min_relationship_value,
-                    max_relationship_value, benefits_description, annual_fee
-                ) VALUES (%s, %s, %s, %s, %s, %s) RETURNING segment_id;
-            """, (code, name, min_val, max_val, benefits, fee))
-            self.customer_segment_ids.append(self.cursor.fetchone()[0])
+                assignments[employee_id] = manager_id  # Last draw wins, as with sequential updates
         
-        self.conn.commit()
-        print(f"✅ Created {len(self.customer_segment_ids)} customer segments")
-
-    def generate_customer_types(self):
-        """Generate customer types"""
-        print("👤 Generating customer types...")
-        
-        types = [
-            ('INDIVIDUAL', 'Individual Customer', 'Personal banking customer', False, False, 18),
-            ('BUSINESS', 'Business Customer', 'Small business customer', True, True, 18),
-            ('CORPORATE', 'Corporate Customer', 'Large corporate customer', True, True, 21),
-            ('NON_PROFIT', 'Non-Profit Organization', 'Non-profit organization', True, True, 18),
-            ('TRUST', 'Trust Account', 'Trust and estate account', False, False, 18)
-        ]
-        
-        for code, name, desc, license_req, ein_req, min_age in types:
-            self.cursor.execute("""
-                INSERT INTO customer_types (
-                    type_code, type_name, description, requires_business_license,
-                    requires_ein, minimum_age
-                ) VALUES (%s, %s, %s, %s, %s, %s) RETURNING customer_type_id;
-            """, (code, name, desc, license_req, ein_req, min_age))
-            self.customer_type_ids.append(self.cursor.fetchone()[0])
+        self.cursor.execute("""
+            UPDATE employees SET manager_id = v.mgr
+            FROM unnest(%s::int[], %s::int[]) AS v(emp, mgr)
+            WHERE employees.employee_id = v.emp;
+        """, (list(assignments), list(assignments.values())))
         
-        self.conn.commit()
-        print(f"✅ Created {len(self.customer_type_ids)} customer types")
+        print(f"✅ Created {len(self.employee_ids)} employees with management hierarchy")
 
     def generate_customers(self, count=5000):
         """Generate customers with realistic profiles"""
         print(f"👥 Generating {count} customers...")
         
-        employment_statuses = ['EMPLOYED', 'SELF_EMPLOYED', 'UNEMPLOYED', 'RETIRED', 'STUDENT', 'HOMEMAKER']
-        risk_ratings = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
-        kyc_statuses = ['PENDING', 'VERIFIED', 'EXPIRED', 'REJECTED']
-        aml_statuses = ['CLEAR', 'REVIEW', 'SUSPICIOUS', 'BLOCKED']
-        
-        for i in tqdm(range(count), desc="Creating customers"):
-            customer_number = f"CUST{i+1:08d}"
-            customer_type_id = random.choice(self.customer_type_ids)
-            segment_id = random.choice(self.customer_segment_ids)
-            relationship_manager_id = random.choice(self.employee_ids) if random.random() < 0.7 else None
-            primary_branch_id = random.choice(self.branch_ids)
-
-            first_name = fake.first_name()[:50]  # Truncate to 50 chars
-            last_name = fake.last_name()[:50]   # Truncate to 50 chars
-            email = fake.unique.email()
-            
-            # Generate realistic financial profile
-            annual_income = random.randint(25000, 500000)
-            credit_score = random.randint(300, 850)
-            total_relationship_value = random.randint(1000, 1000000)
-            
-            customer_since = fake.date_between(start_date='-20y', end_date='today')
-            
-            self.cursor.execute("""
-                INSERT INTO customers (
-                    customer_number, customer_type_id, segment_id, relationship_manager_id,
-                    primary_branch_id, first_name, last_name, email, phone_primary,
-                    address_line1, city_id, zip_code, date_of_birth, ssn,
-                    annual_income, employment_status, employer_name, occupation,
-                    credit_score, customer_since, risk_rating, kyc_status, aml_status,
-                    total_relationship_value, lifetime_value
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING customer_id;
-            """, (
-                customer_number, customer_type_id, segment_id, relationship_manager_id,
-                primary_branch_id, first_name, last_name, email, fake.phone_number()[:15],
-                fake.street_address(), random.choice(self.city_ids), fake.postcode(),
-                fake.date_of_birth(minimum_age=18, maximum_age=90), fake.ssn(),
-                annual_income, random.choice(employment_statuses), fake.company()[:100],
-                fake.job()[:50], credit_score, customer_since,
-                random.choice(risk_ratings), random.choice(kyc_statuses), random.choice(aml_statuses),
-                total_relationship_value, total_relationship_value * random.uniform(1.1, 1.5)
-            ))
-            self.customer_ids.append(self.cursor.fetchone()[0])
+        # Rows are built lazily and streamed straight into COPY
+        customer_ids = self.reserve_ids('customers', 'customer_id', count)
+        rows = self.iter_rows_parallel(build_customer_rows, count, "Creating customers")
         
-        self.conn.commit()
-        print(f"✅ Created {len(self.customer_ids)} customers")
-
-    def generate_product_categories(self):
-        """Generate product categories"""
-        print("📦 Generating product categories...")
-        
-        categories = [
-            ('CHECKING', 'Checking Accounts', 'DEPOSIT', 'Demand deposit accounts'),
-            ('SAVINGS', 'Savings Accounts', 'DEPOSIT', 'Savings and money market accounts'),
-            ('CD', 'Certificates of Deposit', 'DEPOSIT', 'Time deposit accounts'),
-            ('MORTGAGE', 'Mortgage Loans', 'LOAN', 'Residential mortgage products'),
-            ('AUTO', 'Auto Loans', 'LOAN', 'Vehicle financing'),
-            ('PERSONAL', 'Personal Loans', 'LOAN', 'Unsecured personal loans'),
-            ('CREDIT', 'Credit Cards', 'CARD', 'Credit card products'),
-            ('DEBIT', 'Debit Cards', 'CARD', 'Debit card products'),
-            ('INVESTMENT', 'Investment Products', 'INVESTMENT', 'Investment and brokerage'),
-            ('INSURANCE', 'Insurance Products', 'INSURANCE', 'Banking insurance products')
-        ]
+        self.copy_rows('customers', (
+            'customer_id', 'customer_number', 'customer_type_id', 'segment_id', 'relationship_manager_id',
+            'primary_branch_id', 'first_name', 'last_name', 'email', 'phone_primary',
+            'address_line1', 'city_id', 'zip_code', 'date_of_birth', 'ssn',
+            'annual_income', 'employment_status', 'employer_name', 'occupation',
+            'credit_score', 'customer_since', 'risk_rating', 'kyc_status', 'aml_status',
+            'total_relationship_value', 'lifetime_value'
+        ), ((customer_id, *row) for row, customer_id in zip(rows, customer_ids)))
+        self.customer_ids.extend(customer_ids)
         
-        for code, name, type_cat, desc in categories:
-            self.cursor.execute("""
-                INSERT INTO product_categories (category_code, category_name, category_type, description)
-                VALUES (%s, %s, %s, %s) RETURNING category_id;
-            """, (code, name, type_cat, desc))
-            self.product_category_ids.append(self.cursor.fetchone()[0])
-        
-        self.conn.commit()
-        print(f"✅ Created {len(self.product_category_ids)} product categories")
+        print(f"✅ Created {len(self.customer_ids)} customers")
 
     def generate_products(self, count=50):
         """Generate banking products"""
@@ -448,276 +989,226 @@ class BankingDataGenerator:
             ('CD_60M', '60 Month CD', 1000, None, 0.0500, 0.0100, 0, 0, 0)
         ]
         
-        products_created = 0
-        for code, name, min_bal, max_bal, interest, penalty, monthly, annual, overdraft in product_templates:
-            if products_created >= count:
-                break
-                
+        rows = []
+        for code, name, min_bal, max_bal, interest, penalty, monthly, annual, overdraft in product_templates[:count]:
             # Find appropriate category
             if 'CHK' in code:
-                category_id = next(id for id in self.product_category_ids if self.get_category_code(id) == 'CHECKING')
+                category_id = self.category_code_to_id['CHECKING']
             elif 'SAV' in code or 'MONEY' in code:
-                category_id = next(id for id in self.product_category_ids if self.get_category_code(id) == 'SAVINGS')
+                category_id = self.category_code_to_id['SAVINGS']
             elif 'CD' in code:
-                category_id = next(id for id in self.product_category_ids if self.get_category_code(id) == 'CD')
+                category_id = self.category_code_to_id['CD']
             else:
                 category_id = random.choice(self.product_category_ids)
             
-            self.cursor.execute("""
-                INSERT INTO products (
-                    category_id, product_code, product_name, minimum_balance,
-                    maximum_balance, base_interest_rate, penalty_rate,
-                    monthly_fee, annual_fee, overdraft_limit
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING product_id;
-            """, (category_id, code, name, min_bal, max_bal, interest, penalty, monthly, annual, overdraft))
-            self.product_ids.append(self.cursor.fetchone()[0])
-            products_created += 1
+            rows.append((category_id, code, name, min_bal, max_bal, interest, penalty, monthly, annual, overdraft))
         
         # Generate additional random products
-        for i in range(count - products_created):
+        for i in range(count - len(rows)):
             category_id = random.choice(self.product_category_ids)
             product_code = f"PROD{i+100:03d}"
             product_name = f"{fake.company()[:100]} Product"
 
-            self.cursor.execute("""
-                INSERT INTO products (
-                    category_id, product_code, product_name, minimum_balance,
-                    base_interest_rate, monthly_fee, annual_fee
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING product_id;
-            """, (
+            rows.append((
                 category_id, product_code, product_name,
-                random.randint(0, 5000), random.uniform(0.0000, 0.0500),
-                random.randint(0, 25), random.randint(0, 100)
+                random.randint(0, 5000), None, random.uniform(0.0000, 0.0500), 0,
+                random.randint(0, 25), random.randint(0, 100), 0
             ))
-            self.product_ids.append(self.cursor.fetchone()[0])
         
-        self.conn.commit()
+        returned = execute_values(self.cursor, """
+            INSERT INTO products (
+                category_id, product_code, product_name, minimum_balance,
+                maximum_balance, base_interest_rate, penalty_rate,
+                monthly_fee, annual_fee, overdraft_limit
+            ) VALUES %s
+            RETURNING product_id;
+        """, rows, page_size=1000, fetch=True)
+        self.product_ids.extend(r[0] for r in returned)
+        
         print(f"✅ Created {len(self.product_ids)} products")
 
-    def get_category_code(self, category_id):
-        """Helper to get category code by ID"""
-        self.cursor.execute("SELECT category_code FROM product_categories WHERE category_id = %s", (category_id,))
-        result = self.cursor.fetchone()
-        return result[0] if result else None
-
     def generate_accounts(self, count=8000):
         """Generate customer accounts"""
         print(f"💰 Generating {count} accounts...")
         
-        for i in tqdm(range(count), desc="Creating accounts"):
-            customer_id = random.choice(self.customer_ids)
-            product_id = random.choice(self.product_ids)
-            branch_id = random.choice(self.branch_ids)
-            relationship_manager_id = random.choice(self.employee_ids) if random.random() < 0.6 else None
-            
-            account_number = f"{random.randint(100000000, 999999999)}"
-            current_balance = random.uniform(100, 100000)
-            available_balance = current_balance * random.uniform(0.8, 1.0)
-            
-            opened_date = fake.date_between(start_date='-10y', end_date='today')
-            
-            self.cursor.execute("""
-                INSERT INTO accounts (
-                    customer_id, product_id, branch_id, relationship_manager_id,
-                    account_number, current_balance, available_balance,
-                    pending_balance, minimum_balance, interest_rate,
-                    opened_date, daily_transaction_limit, monthly_transaction_limit
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING account_id;
-            """, (
-                customer_id, product_id, branch_id, relationship_manager_id,
-                account_number, current_balance, available_balance,
-                random.uniform(0, 1000), random.uniform(0, 2500),
-                random.uniform(0.0000, 0.0500), opened_date,
-                random.randint(1000, 10000), random.randint(50000, 200000)
-            ))
-            self.account_ids.append(self.cursor.fetchone()[0])
+        # Rows are built lazily and streamed straight into COPY
+        account_ids = self.reserve_ids('accounts', 'account_id', count)
+        rows = self.iter_rows_parallel(build_account_rows, count, "Creating accounts")
+        
+        self.copy_rows('accounts', (
+            'account_id', 'customer_id', 'product_id', 'branch_id', 'relationship_manager_id',
+            'account_number', 'current_balance', 'available_balance',
+            'pending_balance', 'minimum_balance', 'interest_rate',
+            'opened_date', 'daily_transaction_limit', 'monthly_transaction_limit'
+        ), ((account_id, *row) for row, account_id in zip(rows, account_ids)))
+        self.account_ids.extend(account_ids)
         
-        self.conn.commit()
         print(f"✅ Created {len(self.account_ids)} accounts")
 
-    def generate_transaction_types(self):
-        """Generate transaction types"""
-        print("📝 Generating transaction types...")
-        
-        types = [
-            ('DEPOSIT', 'Deposit', 'Cash or check deposit', 'CREDIT', False, False, False),
-            ('WITHDRAWAL', 'Withdrawal', 'Cash withdrawal', 'DEBIT', False, True, False),
-            ('XFER_IN', 'Transfer In', 'Incoming transfer', 'CREDIT', False, False, False),
-            ('XFER_OUT', 'Transfer Out', 'Outgoing transfer', 'DEBIT', False, True, False),
-            ('FEE', 'Fee', 'Bank fee charge', 'DEBIT', False, False, True),
-            ('INTEREST', 'Interest', 'Interest payment', 'CREDIT', False, False, True),
-            ('PURCHASE', 'Purchase', 'Debit card purchase', 'DEBIT', False, False, False),
-            ('ATM', 'ATM Transaction', 'ATM withdrawal or deposit', 'BOTH', False, True, False),
-            ('CHECK', 'Check Payment', 'Check clearing', 'DEBIT', False, False, False),
-            ('ACH_DB', 'ACH Debit', 'Automated clearing house debit', 'DEBIT', False, False, True),
-            ('ACH_CR', 'ACH Credit', 'Automated clearing house credit', 'CREDIT', False, False, True),
-            ('WIRE_IN', 'Wire Transfer In', 'Incoming wire transfer', 'CREDIT', True, True, True),
-            ('WIRE_OUT', 'Wire Transfer Out', 'Outgoing wire transfer', 'DEBIT', True, True, True),
-            ('OVERDRAFT', 'Overdraft Fee', 'Overdraft penalty', 'DEBIT', False, False, True),
-            ('REFUND', 'Refund', 'Transaction refund', 'CREDIT', False, False, False)
-       ]
-       
-        for code, name, desc, debit_credit, approval, fee, reporting in types:
-           self.cursor.execute("""
-               INSERT INTO transaction_types (
-                   type_code, type_name, description, debit_credit,
-                   requires_approval, fee_applicable, regulatory_reporting
-               ) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING transaction_type_id;
-           """, (code, name, desc, debit_credit, approval, fee, reporting))
-           self.transaction_type_ids.append(self.cursor.fetchone()[0])
-
-        self.conn.commit()
-        print(f"✅ Created {len(self.transaction_type_ids)} transaction types")
-
-    def generate_merchant_categories(self):
-       """Generate merchant category codes (MCC)"""
-       print("🏪 Generating merchant categories...")
-       
-       mccs = [
-           ('5411', 'Grocery Stores', 'Supermarkets and grocery stores', 'LOW'),
-           ('5541', 'Service Stations', 'Gas stations and fuel', 'LOW'),
-           ('5812', 'Eating Places', 'Restaurants and dining', 'LOW'),
-           ('5311', 'Department Stores', 'General merchandise stores', 'LOW'),
-           ('5691', 'Mens and Womens Clothing', 'Apparel and clothing', 'LOW'),
-           ('5732', 'Electronics Stores', 'Consumer electronics', 'MEDIUM'),
-           ('5999', 'Miscellaneous Retail', 'Other retail establishments', 'MEDIUM'),
-           ('6011', 'Financial Institutions', 'Banks and credit unions', 'HIGH'),
-           ('7011', 'Hotels and Motels', 'Lodging establishments', 'MEDIUM'),
-           ('7841', 'Video Entertainment', 'Movie theaters and entertainment', 'LOW'),
-           ('4111', 'Transportation', 'Local and suburban transit', 'LOW'),
-           ('5967', 'Direct Marketing', 'Mail order and online retail', 'MEDIUM'),
-           ('5993', 'Cigar Stores', 'Tobacco products', 'HIGH'),
-           ('7995', 'Gambling', 'Betting and gambling', 'HIGH'),
-           ('6051', 'Quasi Cash', 'Money orders and traveler checks', 'HIGH')
-       ]
-       
-       for code, name, desc, risk in mccs:
-           self.cursor.execute("""
-               INSERT INTO merchant_categories (mcc_code, category_name, category_description, risk_level)
-               VALUES (%s, %s, %s, %s) RETURNING mcc_id;
-           """, (code, name, desc, risk))
-           self.mcc_ids.append(self.cursor.fetchone()[0])
-       
-       self.conn.commit()
-       print(f"✅ Created {len(self.mcc_ids)} merchant categories")
-
     def generate_merchants(self, count=1000):
-       """Generate merchants"""
-       print(f"🏢 Generating {count} merchants...")
-       
-       for i in tqdm(range(count), desc="Creating merchants"):
-           mcc_id = random.choice(self.mcc_ids)
-           merchant_name = fake.company()[:100],  # employer_name
-           dba_name = merchant_name if random.random() < 0.7 else fake.company()[:100]
-           merchant_number = f"MERCH{i+1:06d}"
-           city_id = random.choice(self.city_ids)
-           
-           self.cursor.execute("""
-               INSERT INTO merchants (
-                   mcc_id, merchant_name, dba_name, merchant_number,
-                   city_id, address_line1, zip_code, phone
-               ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING merchant_id;
-           """, (
-               mcc_id, merchant_name, dba_name, merchant_number,
-               city_id, fake.street_address(), fake.postcode(), fake.phone_number()[:15]
-           ))
-           self.merchant_ids.append(self.cursor.fetchone()[0])
-       
-       self.conn.commit()
-       print(f"✅ Created {len(self.merchant_ids)} merchants")
+        """Generate merchants"""
+        print(f"🏢 Generating {count} merchants...")
+        
+        # Rows are built lazily and streamed straight into COPY
+        merchant_ids = self.reserve_ids('merchants', 'merchant_id', count)
+        rows = self.iter_rows_parallel(build_merchant_rows, count, "Creating merchants")
+        
+        self.copy_rows('merchants', (
+            'merchant_id', 'mcc_id', 'merchant_name', 'dba_name', 'merchant_number',
+            'city_id', 'address_line1', 'zip_code', 'phone'
+        ), ((merchant_id, *row) for row, merchant_id in zip(rows, merchant_ids)))
+        self.merchant_ids.extend(merchant_ids)
+        
+        print(f"✅ Created {len(self.merchant_ids)} merchants")
 
     def generate_transactions(self, count=50000):
-       """Generate realistic banking transactions"""
-       print(f"💳 Generating {count} transactions...")
-       
-       channels = ['ATM', 'ONLINE', 'MOBILE', 'BRANCH', 'PHONE', 'ACH', 'WIRE', 'CHECK', 'CARD']
-       statuses = ['PENDING', 'POSTED', 'DECLINED', 'REVERSED', 'CANCELLED']
-       
-       for i in tqdm(range(count), desc="Creating transactions"):
-           account_id = random.choice(self.account_ids)
-           transaction_type_id = random.choice(self.transaction_type_ids)
-           merchant_id = random.choice(self.merchant_ids) if random.random() < 0.7 else None
-           
-           transaction_number = f"TXN{i+1:010d}"
-           transaction_amount = round(random.uniform(-5000, 5000), 2)
-           fee_amount = round(random.uniform(0, 25), 2) if random.random() < 0.2 else 0
-           total_amount = transaction_amount + fee_amount
-           
-           transaction_date = fake.date_time_between(start_date='-2y', end_date='now')
-           
-           # Generate realistic running balance
-           running_balance = round(random.uniform(100, 50000), 2)
-           
-           self.cursor.execute("""
-               INSERT INTO transactions (
-                   account_id, transaction_type_id, merchant_id, transaction_number,
-                   reference_number, authorization_code, transaction_amount,
-                   fee_amount, total_amount, running_balance, original_amount,
-                   original_currency, exchange_rate, transaction_date,
-                   value_date, posted_date, description, memo, category,
-                   channel, terminal_id, location_description, city_id,
-                   status, risk_score, fraud_flag, aml_flag, batch_id
-               ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-               RETURNING transaction_id;
-           """, (
-               account_id, transaction_type_id, merchant_id, transaction_number,
-               f"REF{random.randint(100000, 999999)}", f"AUTH{random.randint(100000, 999999)}",
-               transaction_amount, fee_amount, total_amount, running_balance,
-               abs(transaction_amount), 'USD', 1.000000, transaction_date,
-               transaction_date.date(), transaction_date + timedelta(hours=random.randint(1, 48)),
-               fake.sentence(nb_words=6), fake.text(max_nb_chars=50),
-               random.choice(['GROCERIES', 'GAS', 'DINING', 'SHOPPING', 'BILLS', 'ENTERTAINMENT']),
-               random.choice(channels), f"TERM{random.randint(1000, 9999)}",
-               fake.street_address(), random.choice(self.city_ids),
-               random.choice(statuses), random.randint(0, 100),
-               random.random() < 0.01, random.random() < 0.005,
-               f"BATCH{random.randint(1000, 9999)}"
-           ))
-       
-       self.conn.commit()
-       print(f"✅ Created {count} transactions")
+        """Generate realistic banking transactions"""
+        print(f"💳 Generating {count} transactions...")
+        
+        # Rows are built lazily and streamed straight into COPY; ids come from the column default.
+        # Larger shards keep each worker's vectorized draws worthwhile
+        rows = self.iter_rows_parallel(build_transaction_rows, count, "Creating transactions", shard_size=5000)
+        
+        # Binary COPY ships the many numeric, timestamp and boolean columns without text parsing
+        money = numeric_encoder(2)
+        self.copy_rows_binary('transactions', (
+            ('account_id', encode_int4), ('transaction_type_id', encode_int4),
+            ('merchant_id', encode_int4), ('transaction_number', encode_text),
+            ('reference_number', encode_text), ('authorization_code', encode_text),
+            ('transaction_amount', money), ('fee_amount', money), ('total_amount', money),
+            ('running_balance', money), ('original_amount', money),
+            ('original_currency', encode_text), ('exchange_rate', numeric_encoder(6)),
+            ('transaction_date', encode_int8), ('value_date', encode_int4),
+            ('posted_date', encode_int8), ('description', encode_text),
+            ('memo', encode_text), ('category', encode_text), ('channel', encode_text),
+            ('terminal_id', encode_text), ('location_description', encode_text),
+            ('city_id', encode_int4), ('status', encode_text), ('risk_score', encode_int4),
+            ('fraud_flag', encode_bool), ('aml_flag', encode_bool), ('batch_id', encode_text)
+        ), rows)
+        
+        print(f"✅ Created {count} transactions")
+
+    def generate_transactions_server_side(self, count=50000):
+        """Generate transactions with a single INSERT ... SELECT evaluated by PostgreSQL"""
+        print(f"💳 Generating {count} transactions server-side...")
+        
+        # setseed() takes a value in [-1, 1]; seeding keeps random() reproducible
+        self.cursor.execute("SELECT setseed(%s);", (SEED / 100,))
+        
+        # Every value is drawn by random() over generate_series; foreign keys and code
+        # columns are picked from arrays sent once as parameters, and free text is md5 filler
+        self.cursor.execute("""
+            WITH p AS (
+                SELECT %(account_ids)s::int[] AS account_ids,
+                       %(transaction_type_ids)s::int[] AS transaction_type_ids,
+                       %(merchant_ids)s::int[] AS merchant_ids,
+                       %(city_ids)s::int[] AS city_ids,
+                       %(channels)s::text[] AS channels,
+                       %(statuses)s::text[] AS statuses,
+                       %(categories)s::text[] AS categories
+            ),
+            d AS (
+                SELECT n,
+                       round((random() * 10000 - 5000)::numeric, 2) AS amount,
+                       CASE WHEN random() < 0.2 THEN round((random() * 25)::numeric, 2) ELSE 0 END AS fee,
+                       now() - random() * interval '730 days' AS transaction_date
+                FROM generate_series(1, %(count)s) AS n
+            )
+            INSERT INTO transactions (
+                account_id, transaction_type_id, merchant_id, transaction_number,
+                reference_number, authorization_code, transaction_amount,
+                fee_amount, total_amount, running_balance, original_amount,
+                original_currency, exchange_rate, transaction_date,
+                value_date, posted_date, description, memo, category,
+                channel, terminal_id, location_description, city_id,
+                status, risk_score, fraud_flag, aml_flag, batch_id
+            )
+            SELECT
+                p.account_ids[1 + floor(random() * cardinality(p.account_ids))::int],
+                p.transaction_type_ids[1 + floor(random() * cardinality(p.transaction_type_ids))::int],
+                CASE WHEN random() < 0.7
+                     THEN p.merchant_ids[1 + floor(random() * cardinality(p.merchant_ids))::int] END,
+                'TXN' || lpad(d.n::text, 10, '0'),
+                'REF' || (100000 + floor(random() * 900000))::int,
+                'AUTH' || (100000 + floor(random() * 900000))::int,
+                d.amount, d.fee, d.amount + d.fee,
+                round((100 + random() * 49900)::numeric, 2),
+                abs(d.amount), 'USD', 1.000000, d.transaction_date,
+                d.transaction_date::date,
+                d.transaction_date + (1 + floor(random() * 48)) * interval '1 hour',
+                substr(md5(random()::text || d.n::text), 1, 30) || ' transaction',
+                substr(md5(random()::text || d.n::text), 1, 40),
+                p.categories[1 + floor(random() * cardinality(p.categories))::int],
+                p.channels[1 + floor(random() * cardinality(p.channels))::int],
+                'TERM' || (1000 + floor(random() * 9000))::int,
+                (100 + floor(random() * 9900))::int || ' ' || initcap(substr(md5(random()::text), 1, 8)) || ' St',
+                p.city_ids[1 + floor(random() * cardinality(p.city_ids))::int],
+                p.statuses[1 + floor(random() * cardinality(p.statuses))::int],
+                floor(random() * 101)::int,
+                random() < 0.01, random() < 0.005,
+                'BATCH' || (1000 + floor(random() * 9000))::int
+            FROM d CROSS JOIN p;
+        """, {
+            'account_ids': self.account_ids,
+            'transaction_type_ids': self.transaction_type_ids,
+            'merchant_ids': self.merchant_ids,
+            'city_ids': self.city_ids,
+            'channels': list(TRANSACTION_CHANNELS),
+            'statuses': list(TRANSACTION_STATUSES),
+            'categories': list(TRANSACTION_CATEGORIES),
+            'count': count,
+        })
+        
+        print(f"✅ Created {count} transactions")
 
     def generate_summary_stats(self):
-       """Generate and display summary statistics"""
-       print("\n📊 Database Summary Statistics")
-       print("=" * 50)
-       
-       tables = [
-           'countries', 'states', 'cities', 'regions', 'branches', 'departments',
-           'employees', 'customer_segments', 'customer_types', 'customers',
-           'product_categories', 'products', 'accounts', 'transaction_types',
-           'merchant_categories', 'merchants', 'transactions'
-       ]
-       
-       for table in tables:
-           self.cursor.execute(f"SELECT COUNT(*) FROM {table};")
-           count = self.cursor.fetchone()[0]
-           print(f"📋 {table.replace('_', ' ').title()}: {count:,} records")
-       
-       # Additional analytics
-       self.cursor.execute("""
-           SELECT 
-               SUM(current_balance) as total_deposits,
-               AVG(current_balance) as avg_balance,
-               COUNT(*) as total_accounts
-           FROM accounts;
-       """)
-       deposits, avg_balance, total_accounts = self.cursor.fetchone()
-       print(f"\n💰 Total Deposits: ${deposits:,.2f}")
-       print(f"📈 Average Account Balance: ${avg_balance:,.2f}")
-       print(f"🏦 Total Accounts: {total_accounts:,}")
-       
-       self.cursor.execute("""
-           SELECT 
-               SUM(transaction_amount) as total_transaction_volume,
-               COUNT(*) as total_transactions
-           FROM transactions 
-           WHERE status = 'POSTED';
-       """)
-       volume, txn_count = self.cursor.fetchone()
-       print(f"💳 Total Transaction Volume: ${volume:,.2f}")
-       print(f"📊 Total Posted Transactions: {txn_count:,}")
+        """Generate and display summary statistics"""
+        print("\n📊 Database Summary Statistics")
+        print("=" * 50)
+        
+        tables = [
+            'countries', 'states', 'cities', 'regions', 'branches', 'departments',
+            'employees', 'customer_segments', 'customer_types', 'customers',
+            'product_categories', 'products', 'accounts', 'transaction_types',
+            'merchant_categories', 'merchants', 'transactions'
+        ]
+        
+        # All counts and analytics come back as one row from a single round-trip; accounts
+        # and transactions are each scanned once, their counts taken alongside the aggregates
+        scanned_counts = {'accounts': 'a.total_accounts', 'transactions': 't.all_transactions'}
+        count_columns = ", ".join(
+            scanned_counts.get(table, f"(SELECT COUNT(*) FROM {table})") for table in tables
+        )
+        self.cursor.execute(f"""
+            SELECT {count_columns},
+                   a.total_deposits, a.avg_balance, a.total_accounts,
+                   t.total_transaction_volume, t.total_transactions
+            FROM (
+                SELECT 
+                    SUM(current_balance) as total_deposits,
+                    AVG(current_balance) as avg_balance,
+                    COUNT(*) as total_accounts
+                FROM accounts
+            ) a, (
+                SELECT 
+                    COUNT(*) as all_transactions,
+                    SUM(transaction_amount) FILTER (WHERE status = 'POSTED') as total_transaction_volume,
+                    COUNT(*) FILTER (WHERE status = 'POSTED') as total_transactions
+                FROM transactions
+            ) t;
+        """)
+        stats = self.cursor.fetchone()
+        
+        for table, count in zip(tables, stats):
+            print(f"📋 {table.replace('_', ' ').title()}: {count:,} records")
+        
+        # Additional analytics
+        deposits, avg_balance, total_accounts, volume, txn_count = stats[len(tables):]
+        print(f"\n💰 Total Deposits: ${deposits:,.2f}")
+        print(f"📈 Average Account Balance: ${avg_balance:,.2f}")
+        print(f"🏦 Total Accounts: {total_accounts:,}")
+        print(f"💳 Total Transaction Volume: ${volume:,.2f}")
+        print(f"📊 Total Posted Transactions: {txn_count:,}")
 
 def main():
     parser = argparse.ArgumentParser(description='Generate comprehensive banking data')
@@ -726,6 +1217,8 @@ def main():
     parser.add_argument('--transactions', type=int, default=50000, help='Number of transactions to generate')
     parser.add_argument('--employees', type=int, default=800, help='Number of employees to generate')
     parser.add_argument('--merchants', type=int, default=1000, help='Number of merchants to generate')
+    parser.add_argument('--server-side-transactions', action='store_true',
+                        help='Generate transactions inside PostgreSQL with one INSERT ... SELECT')
     parser.add_argument('--db-name', default='banking_rag_db', help='Database name')
     parser.add_argument('--host', default='localhost', help='Database host')
     parser.add_argument('--port', default='5432', help='Database port')
@@ -736,10 +1229,10 @@ def main():
     # Connect to PostgreSQL
     try:
         conn = psycopg2.connect(
-           host=args.host,
-           port=args.port,
-           database=args.db_name,
-           user=args.user
+            host=args.host,
+            port=args.port,
+            database=args.db_name,
+            user=args.user
         )
         print(f"✅ Connected to PostgreSQL database: {args.db_name}")
 
@@ -749,30 +1242,40 @@ def main():
         print("\n🚀 Starting comprehensive banking data generation...")
         print("=" * 60)
 
-        # Generate reference data first (required for foreign keys)
-        generator.generate_countries()
-        generator.generate_states()
-        generator.generate_cities()
-        generator.generate_regions()
-        generator.generate_branches()
-        generator.generate_departments()
-        generator.generate_employees(args.employees)
-
-        # Generate customer framework
-        generator.generate_customer_segments()
-        generator.generate_customer_types()
-        generator.generate_customers(args.customers)
-
-        # Generate products and accounts
-        generator.generate_product_categories()
-        generator.generate_products()
-        generator.generate_accounts(args.accounts)
-
-        # Generate transaction framework
-        generator.generate_transaction_types()
-        generator.generate_merchant_categories()
-        generator.generate_merchants(args.merchants)
-        generator.generate_transactions(args.transactions)
+        # The whole load runs as one transaction: committed on success, rolled back on error
+        try:
+            with conn:
+                generator.pre_load_optimize()
+
+                # Generate reference data first (required for foreign keys)
+                generator.generate_reference_data()
+                generator.generate_states()
+                generator.generate_cities()
+                generator.generate_branches()
+                generator.generate_employees(args.employees)
+
+                # Generate customer framework
+                generator.generate_customers(args.customers)
+
+                # Generate products and accounts
+                generator.generate_products()
+                generator.generate_accounts(args.accounts)
+
+                # Generate transaction framework
+                generator.generate_merchants(args.merchants)
+                if args.server_side_transactions:
+                    generator.generate_transactions_server_side(args.transactions)
+                else:
+                    generator.generate_transactions(args.transactions)
+
+                generator.post_load_rebuild()
+                generator.restore_session_settings()
+        except BaseException:
+            # Don't wait on queued shards after a failure; workers must never outlive the load
+            generator.close_worker_pool(terminate=True)
+            raise
+
+        generator.close_worker_pool()
 
         # Generate summary
         generator.generate_summary_stats()
@@ -789,4 +1292,3 @@ def main():
 
 if __name__ == "__main__":
     exit(main())
-EOF           
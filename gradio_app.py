@@ -10,31 +10,77 @@ Date: June 2025
 import os
 import sys
 import json
+import asyncio
 import time
+import threading
 import pandas as pd
+from collections import OrderedDict, deque
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
 import gradio as gr
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from urllib.parse import quote
+
+try:
+    from sqlglot import exp
+except ImportError:
+    exp = None
+
+try:
+    import pyarrow as pa
+    import adbc_driver_postgresql.dbapi as adbc_postgresql
+except ImportError:
+    adbc_postgresql = None
 
 # Add src to Python path
 sys.path.append(str(Path(__file__).parent / "src"))
 
 try:
-    from database.schema_analyzer import SchemaAnalyzer
+    from database.schema_analyzer import (
+        SchemaAnalyzer, ENHANCED_SCHEMA_FILE, load_enhanced_schema, save_enhanced_schema
+    )
     from sql.query_generator import NLToSQLGenerator
-    from sql.dialect_translator import SQLDialectTranslator
+    from sql.dialect_translator import SQLDialectTranslator, parse_postgres_statements
 except ImportError as e:
     print(f"❌ Import error: {e}")
     print("Make sure you're in the project root directory")
     sys.exit(1)
 
+# Result streaming limits for executed queries
+MAX_DISPLAY_ROWS = 10_000
+FETCH_BATCH_SIZE = 5_000
+STATEMENT_TIMEOUT = '30s'
+
+# AST nodes that write data or change the schema; any of them anywhere rejects a query
+WRITE_NODE_TYPES = tuple(
+    getattr(exp, name) for name in (
+        'Insert', 'Update', 'Delete', 'Merge', 'Into', 'Create', 'Drop', 'Alter', 'AlterTable',
+        'TruncateTable', 'Copy', 'Grant', 'Command'
+    ) if exp is not None and hasattr(exp, name)
+)
+
+# Static UI assets, read once at import
+STATIC_DIR = Path(__file__).parent / "static"
+APP_CSS = (STATIC_DIR / "app.css").read_text()
+HEADER_HTML = (STATIC_DIR / "header.html").read_text()
+EXAMPLES_PANEL_HTML = (STATIC_DIR / "examples_panel.html").read_text()
+SYSTEM_INFO_HTML = (STATIC_DIR / "system_info.html").read_text()
+ERD_PANEL_HTML = (STATIC_DIR / "erd_panel.html").read_text()
+
 
 class SQLRAGWebInterface:
     """Professional Gradio web interface for SQL RAG system"""
     
+    EMPTY_QUESTION_MESSAGE = "Please enter a question"
+    MAX_USERS = 1024            # sessions kept before the least recently active is evicted
+    MAX_QUERIES_PER_USER = 100  # per-user query history ring buffer
+    MAX_RENDERED_TRANSLATIONS = 128  # multi-dialect results kept for repeated clicks
+    NO_QUERY_TO_TRANSLATE = "No query to translate"
+    
     def __init__(self):
         self.db_config = {
             'host': 'localhost',
@@ -50,15 +96,22 @@ class SQLRAGWebInterface:
             'oracle': 'Oracle Database',
             'sqlserver': 'SQL Server'
         }
+        self.dialect_names = pd.Series(self.dialects)  # vectorized dialect lookup for history
+        
+        # Status-message prefixes are fixed per dialect, so build them once
+        self.translated_prefix = {d: f"Translated to {name}: " for d, name in self.dialects.items()}
+        self.translation_failed = {d: f"Translation to {name} failed, using PostgreSQL" for d, name in self.dialects.items()}
         
         # Core components
-        self.connection = None
+        self.pool = None
+        self.arrow_connections = threading.local()
         self.schema_analyzer = None
         self.query_generator = None
         self.dialect_translator = SQLDialectTranslator()
+        self.rendered_translations = OrderedDict()  # stripped SQL -> rendered markdown, LRU
         
         # Session management
-        self.user_sessions = {}
+        self.user_sessions = OrderedDict()  # LRU: least recently active user first
         self.current_user = None
         
         # Initialize components
@@ -67,31 +120,42 @@ class SQLRAGWebInterface:
     def initialize_components(self):
         """Initialize database connection and components"""
         try:
-            # Database connection
-            self.connection = psycopg2.connect(**self.db_config)
-            
-            # Schema analyzer
-            self.schema_analyzer = SchemaAnalyzer(self.connection)
-            schema_info = self.schema_analyzer.extract_complete_schema()
+            # Database connection pool (one connection per concurrent request)
+            self.pool = ThreadedConnectionPool(4, 32, **self.db_config)
             
-            # Enhanced schema context
-            enhanced_schema = self.enhance_schema_context(schema_info)
-            
-            # Save enhanced schema
-            schema_file = "data/schemas/enhanced_schema_analysis.json"
-            os.makedirs("data/schemas", exist_ok=True)
+            # Schema analyzer borrows a connection once at startup
+            connection = self.pool.getconn()
+            try:
+                self.schema_analyzer = SchemaAnalyzer(connection)
+                schema_version = self.schema_analyzer.get_schema_version()
+                
+                # Full extraction only runs when the schema fingerprint changes
+                enhanced_schema = load_enhanced_schema('web', schema_version)
+                if enhanced_schema is None:
+                    # Already keyed on the schema fingerprint, so bypass the analyzer's TTL cache
+                    schema_info = self.schema_analyzer.extract_complete_schema(use_cache=False)
+                    enhanced_schema = self.enhance_schema_context(schema_info)
+                else:
+                    # The fingerprint covers structure only; row counts change with data loads
+                    self.schema_analyzer.refresh_row_counts(enhanced_schema)
+                connection.commit()
+            finally:
+                self.pool.putconn(connection)
             
-            with open(schema_file, 'w') as f:
-                json.dump(enhanced_schema, f, indent=2)
+            # Save enhanced schema (skipped when unchanged on disk)
+            save_enhanced_schema(enhanced_schema, 'web', schema_version)
             
             # Query generator
             api_key = os.getenv('ANTHROPIC_API_KEY')
             if not api_key:
                 raise ValueError("ANTHROPIC_API_KEY not found in environment")
             
-            self.query_generator = NLToSQLGenerator(schema_file, api_key)
+            # Cached SQL is only reused while the schema fingerprint matches the one it was generated for
+            self.query_generator = NLToSQLGenerator(
+                ENHANCED_SCHEMA_FILE, api_key, schema=enhanced_schema, schema_version=schema_version
+            )
             
-            print(f"✅ Initialized: {len(schema_info['tables'])} tables, {len(self.dialects)} dialects")
+            print(f"✅ Initialized: {len(enhanced_schema['tables'])} tables, {len(self.dialects)} dialects")
             
         except Exception as e:
             print(f"❌ Initialization failed: {e}")
@@ -131,24 +195,28 @@ class SQLRAGWebInterface:
             self.current_user = username
             if username not in self.user_sessions:
                 self.user_sessions[username] = {
-                    'queries': [],
+                    'queries': deque(maxlen=self.MAX_QUERIES_PER_USER),
                     'login_time': datetime.now(),
                     'last_activity': datetime.now()
                 }
+            self.user_sessions.move_to_end(username)
+            if len(self.user_sessions) > self.MAX_USERS:
+                self.user_sessions.popitem(last=False)
             return True, f"✅ Welcome {username}!"
         else:
             return False, "❌ Invalid credentials"
     
-    def generate_sql_query(self, question: str, dialect: str, user_state: dict) -> Tuple[str, str, str, dict]:
+    async def generate_sql_query(self, question: str, dialect: str, user_state: dict) -> Tuple[str, str, str, dict]:
         """Generate SQL query from natural language"""
         if not question.strip():
-            return "Please enter a question", "", "", user_state
+            return self.EMPTY_QUESTION_MESSAGE, "", "", user_state
         
         try:
             start_time = time.time()
             
-            # Generate PostgreSQL query first
-            result = self.query_generator.generate_sql_query(question, 'postgresql')
+            # Generate PostgreSQL query first; the blocking LLM call waits on a worker
+            # thread so other sessions keep being served meanwhile
+            result = await asyncio.to_thread(self.query_generator.generate_sql_query, question, 'postgresql')
             generation_time = time.time() - start_time
             
             if result['success']:
@@ -166,10 +234,10 @@ class SQLRAGWebInterface:
                     translation_result = self.dialect_translator.translate_query(sql_query, dialect)
                     if translation_result['success']:
                         translated_sql = translation_result['translated_sql']
-                        translation_notes = f"Translated to {self.dialects[dialect]}: {', '.join(translation_result['translation_notes'])}"
+                        translation_notes = self.translated_prefix[dialect] + ', '.join(translation_result['translation_notes'])
                     else:
                         translated_sql = sql_query
-                        translation_notes = f"Translation to {self.dialects[dialect]} failed, using PostgreSQL"
+                        translation_notes = self.translation_failed[dialect]
                 else:
                     translated_sql = sql_query
                     translation_notes = "Using original PostgreSQL syntax"
@@ -188,6 +256,7 @@ class SQLRAGWebInterface:
                 if self.current_user and self.current_user in self.user_sessions:
                     self.user_sessions[self.current_user]['queries'].append(query_record)
                     self.user_sessions[self.current_user]['last_activity'] = datetime.now()
+                    self.user_sessions.move_to_end(self.current_user)
                 
                 success_message = f"✅ Query generated successfully!\nConfidence: {confidence_display}\nGeneration time: {generation_time:.2f}s\n{translation_notes}"
                 
@@ -201,36 +270,159 @@ class SQLRAGWebInterface:
             error_message = f"❌ Error generating query: {str(e)}"
             return error_message, "", "", user_state
     
-    def execute_query(self, sql_query: str) -> Tuple[str, pd.DataFrame]:
+    async def execute_query(self, sql_query: str) -> Tuple[str, pd.DataFrame]:
         """Execute SQL query and return results"""
         if not sql_query.strip():
             return "No query to execute", pd.DataFrame()
         
+        # psycopg2 blocks, so the query runs on a worker thread while the event loop keeps serving other sessions
+        return await asyncio.to_thread(self.run_query, sql_query)
+    
+    def get_arrow_connection(self):
+        """ADBC connection for the current worker thread (opened on first use)"""
+        connection = getattr(self.arrow_connections, 'connection', None)
+        if connection is None:
+            credentials = quote(self.db_config['user'] or '')
+            if self.db_config['password']:
+                credentials += ':' + quote(self.db_config['password'])
+            uri = f"postgresql://{credentials}@{self.db_config['host']}/{self.db_config['database']}"
+            # Read-only path: autocommit skips the implicit BEGIN/ROLLBACK round trips
+            connection = adbc_postgresql.connect(uri, autocommit=True)
+            with connection.cursor() as cursor:
+                cursor.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+                # Database-side backstop for the query guard: every statement runs read-only
+                cursor.execute("SET default_transaction_read_only = on")
+            self.arrow_connections.connection = connection
+        return connection
+    
+    def run_query_arrow(self, sql_query: str) -> Tuple[str, pd.DataFrame]:
+        """Run a row-returning query over ADBC, building the DataFrame from Arrow batches"""
         try:
             start_time = time.time()
-            cursor = self.connection.cursor()
+            connection = self.get_arrow_connection()
+            
+            with connection.cursor() as cursor:
+                cursor.execute(sql_query)
+                reader = cursor.fetch_record_batch()
+                
+                batches = []
+                row_count = 0
+                truncated = False
+                for batch in reader:
+                    if row_count + batch.num_rows > MAX_DISPLAY_ROWS:
+                        batch = batch.slice(0, MAX_DISPLAY_ROWS - row_count)
+                        truncated = True
+                    batches.append(batch)
+                    row_count += batch.num_rows
+                    if truncated:
+                        break
+                
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+            
+            execution_time = time.time() - start_time
+            
+            if row_count:
+                # Columnar Arrow data goes straight into Arrow-backed pandas columns
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+                return self.query_status(row_count, truncated, execution_time), df
+            return self.query_status(0, False, execution_time), pd.DataFrame()
+        
+        except adbc_postgresql.OperationalError as e:
+            # Drop the broken connection; the next query opens a new one
+            self.arrow_connections.connection = None
+            return f"❌ Query execution error: {str(e)}", pd.DataFrame()
+        
+        except Exception as e:
+            return f"❌ Query execution error: {str(e)}", pd.DataFrame()
+    
+    def query_status(self, row_count: int, truncated: bool, execution_time: float) -> str:
+        """Status message for a successfully executed query"""
+        if not row_count:
+            return f"✅ Query executed successfully!\nNo rows returned\nExecution time: {execution_time:.3f}s"
+        row_summary = f"{row_count} (truncated to first {MAX_DISPLAY_ROWS:,} rows)" if truncated else f"{row_count}"
+        return f"✅ Query executed successfully!\nRows returned: {row_summary}\nExecution time: {execution_time:.3f}s"
+    
+    def guard_query(self, sql_query: str) -> Tuple[str, Optional[str]]:
+        """Allow only read-only queries and cap their row count; returns (sql_to_run, error)"""
+        if exp is None:
+            return sql_query, "the SQL guard needs sqlglot, which is not installed (pip install sqlglot)"
+        statements = parse_postgres_statements(sql_query.strip())
+        
+        # Without an AST there is no way to tell what the SQL does, so it is not run
+        if not statements:
+            return sql_query, "query could not be parsed"
+        if len(statements) > 1:
+            return sql_query, "only a single statement can be executed"
+        
+        tree = statements[0]
+        if not isinstance(tree, (exp.Select, exp.Union, exp.Intersect, exp.Except)):
+            return sql_query, f"only read-only queries can be executed, got {tree.key.upper()}"
+        if tree.find(*WRITE_NODE_TYPES):
+            return sql_query, "data-modifying clauses are not allowed"
+        
+        # One row past the display cap so truncation is still detected
+        if not tree.args.get('limit'):
+            tree = tree.limit(MAX_DISPLAY_ROWS + 1)
+        
+        return tree.sql(dialect='postgres'), None
+    
+    def run_query(self, sql_query: str) -> Tuple[str, pd.DataFrame]:
+        """Run SQL on a pooled connection (blocking)"""
+        sql_query, guard_error = self.guard_query(sql_query)
+        if guard_error:
+            return f"❌ Query rejected: {guard_error}", pd.DataFrame()
+        
+        # Prefer the columnar ADBC path when installed
+        if adbc_postgresql is not None:
+            return self.run_query_arrow(sql_query)
+        
+        connection = self.pool.getconn()
+        try:
+            start_time = time.time()
+            
+            with connection.cursor() as setup:
+                # Database-side backstop for the query guard
+                setup.execute("SET TRANSACTION READ ONLY")
+                setup.execute(f"SET LOCAL statement_timeout = '{STATEMENT_TIMEOUT}'")
+            
+            # Stream through a server-side cursor so only the displayed
+            # rows are ever transferred and held in memory
+            cursor = connection.cursor(name='query_results')
+            cursor.itersize = FETCH_BATCH_SIZE
             cursor.execute(sql_query)
             
-            results = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
+            results = []
+            truncated = False
+            while len(results) < MAX_DISPLAY_ROWS:
+                rows = cursor.fetchmany(min(FETCH_BATCH_SIZE, MAX_DISPLAY_ROWS - len(results)))
+                if not rows:
+                    break
+                results.extend(rows)
+            else:
+                truncated = cursor.fetchone() is not None
+            
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
             execution_time = time.time() - start_time
             
             cursor.close()
-            self.connection.commit()
+            connection.commit()
             
             if results:
                 # Create DataFrame
-                df = pd.DataFrame(results, columns=columns)
-                success_message = f"✅ Query executed successfully!\nRows returned: {len(results)}\nExecution time: {execution_time:.3f}s"
-                return success_message, df
+                df = pd.DataFrame.from_records(results, columns=columns)
+                return self.query_status(len(results), truncated, execution_time), df
             else:
-                success_message = f"✅ Query executed successfully!\nNo rows returned\nExecution time: {execution_time:.3f}s"
-                return success_message, pd.DataFrame()
+                return self.query_status(0, False, execution_time), pd.DataFrame()
                 
         except Exception as e:
-            self.connection.rollback()
+            if not connection.closed:
+                connection.rollback()
             error_message = f"❌ Query execution error: {str(e)}"
             return error_message, pd.DataFrame()
+        
+        finally:
+            # Broken connections are discarded so the pool opens a fresh one
+            self.pool.putconn(connection, close=bool(connection.closed))
     
     def get_user_history(self) -> pd.DataFrame:
         """Get user's query history as DataFrame"""
@@ -241,54 +433,78 @@ class SQLRAGWebInterface:
         if not queries:
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        history_data = []
-        for i, query in enumerate(reversed(queries[-20:]), 1):  # Last 20 queries
-            history_data.append({
-                '#': i,
-                'Time': query['timestamp'][:19],  # Remove microseconds
-                'Question': query['question'][:50] + "..." if len(query['question']) > 50 else query['question'],
-                'Dialect': self.dialects[query['dialect']],
-                'Confidence': query['confidence'],
-                'Gen Time (s)': f"{query['generation_time']:.2f}"
-            })
+        # Last 20 queries, newest first
+        records = pd.DataFrame.from_records(list(islice(reversed(queries), 20)))
+        question = records['question']
+        short_question = question.str.slice(0, 50)
         
-        return pd.DataFrame(history_data)
+        return pd.DataFrame({
+            '#': range(1, len(records) + 1),
+            'Time': records['timestamp'].str.slice(0, 19),  # Remove microseconds
+            'Question': short_question.where(question.str.len() <= 50, short_question + "..."),
+            'Dialect': records['dialect'].map(self.dialect_names),
+            'Confidence': records['confidence'],
+            'Gen Time (s)': records['generation_time'].map("{:.2f}".format)
+        })
     
-    def translate_to_all_dialects(self, sql_query: str) -> str:
+    async def translate_to_all_dialects(self, sql_query: str) -> str:
         """Translate query to all dialects"""
-        if not sql_query.strip():
-            return "No query to translate"
+        sql_query = sql_query.strip()
+        if not sql_query:
+            return self.NO_QUERY_TO_TRANSLATE
+        
+        rendered = self.rendered_translations.get(sql_query)
+        if rendered is not None:
+            self.rendered_translations.move_to_end(sql_query)
+            return rendered
         
         try:
-            batch_result = self.dialect_translator.batch_translate(sql_query)
+            # One worker thread per dialect keeps the event loop free; output order follows the dialect list
+            batch_result = await self.dialect_translator.batch_translate_async(sql_query)
             
-            output = "🔄 **Multi-Dialect Translation Results**\n\n"
+            parts = ["🔄 **Multi-Dialect Translation Results**\n\n"]
             
             for dialect, result in batch_result['translations'].items():
                 dialect_name = self.dialects[dialect]
-                output += f"### 📝 {dialect_name} ({dialect.upper()})\n"
+                parts.append(f"### 📝 {dialect_name} ({dialect.upper()})\n")
                 
                 if result['success']:
-                    output += f"```sql\n{result['translated_sql']}\n```\n"
+                    parts.append(f"```sql\n{result['translated_sql']}\n```\n")
                     if result['translation_notes']:
-                        output += f"**Changes:** {', '.join(result['translation_notes'])}\n"
+                        parts.append(f"**Changes:** {', '.join(result['translation_notes'])}\n")
                 else:
-                    output += f"❌ **Error:** {result['error']}\n"
+                    parts.append(f"❌ **Error:** {result['error']}\n")
                 
-                output += "\n"
+                parts.append("\n")
             
             # Summary
             success_count = sum(1 for result in batch_result['translations'].values() if result['success'])
             total_count = len(batch_result['translations'])
-            output += f"**Summary:** {success_count}/{total_count} dialects translated successfully"
+            parts.append(f"**Summary:** {success_count}/{total_count} dialects translated successfully")
             
-            return output
+            rendered = "".join(parts)
+            self.rendered_translations[sql_query] = rendered
+            if len(self.rendered_translations) > self.MAX_RENDERED_TRANSLATIONS:
+                self.rendered_translations.popitem(last=False)
+            return rendered
             
         except Exception as e:
             return f"❌ Translation error: {str(e)}"
     
-    def export_query(self, sql_query: str, question: str, dialect: str) -> str:
+    def clear_translation_cache(self) -> str:
+        """Clear cached dialect translations"""
+        info = self.dialect_translator.cache_info()
+        self.dialect_translator.clear_cache()
+        self.rendered_translations.clear()
+        return f"♻️ Translation cache cleared ({info.currsize} entries, {info.hits} hits, {info.misses} misses)"
+    
+    @staticmethod
+    def write_export_file(filename: Path, body: str):
+        """Write an export file (blocking); the buffered writer retries short writes"""
+        with open(filename, 'wb') as f:
+            f.write(body.encode())
+    
+    async def export_query(self, sql_query: str, question: str, dialect: str) -> str:
         """Export query to file"""
         if not sql_query.strip():
             return "No query to export"
@@ -300,13 +516,17 @@ class SQLRAGWebInterface:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = exports_dir / f"web_query_{timestamp}.sql"
             
-            with open(filename, 'w') as f:
-                f.write(f"-- SQL RAG Translator Web Interface Export\n")
-                f.write(f"-- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"-- User: {self.current_user or 'Anonymous'}\n")
-                f.write(f"-- Question: {question}\n")
-                f.write(f"-- Target Dialect: {self.dialects[dialect]}\n\n")
-                f.write(sql_query)
+            body = (
+                f"-- SQL RAG Translator Web Interface Export\n"
+                f"-- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"-- User: {self.current_user or 'Anonymous'}\n"
+                f"-- Question: {question}\n"
+                f"-- Target Dialect: {self.dialects[dialect]}\n\n"
+                f"{sql_query}"
+            )
+            
+            # Disk I/O runs on a worker thread so the event loop is never blocked
+            await asyncio.to_thread(self.write_export_file, filename, body)
             
             return f"✅ Query exported to: {filename}"
             
@@ -316,176 +536,10 @@ class SQLRAGWebInterface:
     def create_interface(self):
         """Create the main Gradio interface"""
         
-        # TARGETED CSS FIXES - FORCE OVERRIDES WITH !important
-        custom_css = """
-        /* AGGRESSIVE FIXES FOR GRADIO THEME CONFLICTS */
-
-        /* Fix header */
-        .header-text {
-            background: linear-gradient(90deg, #1e40af, #3b82f6) !important;
-            color: white !important;
-            padding: 30px !important;
-            border-radius: 12px !important;
-            margin-bottom: 25px !important;
-            text-align: center !important;
-        }
-
-        .header-text h1, .header-text p {
-            color: white !important;
-        }
-
-        /* FORCE TAB COLOR FIXES - Target Gradio's actual tab classes */
-        .tab-nav button[aria-selected="true"] {
-            background: #1e40af !important;
-            color: white !important;
-            border-color: #1e40af !important;
-        }
-
-        .tab-nav button {
-            background: #f8fafc !important;
-            color: #374151 !important;
-            border: 1px solid #d1d5db !important;
-        }
-
-        /* Gradio specific overrides */
-        button[role="tab"][aria-selected="true"] {
-            background: #1e40af !important;
-            color: white !important;
-        }
-
-        button[role="tab"] {
-            background: #f8fafc !important;
-            color: #374151 !important;
-        }
-
-        /* FORCE TEXT READABILITY EVERYWHERE */
-        .info-panel {
-            background: #eff6ff !important;
-            border: 2px solid #3b82f6 !important;
-            border-radius: 8px !important;
-            padding: 16px !important;
-            margin: 16px 0 !important;
-        }
-
-        .info-panel h4 {
-            color: #1e40af !important;
-            font-weight: bold !important;
-            margin-bottom: 12px !important;
-        }
-
-        .info-panel li {
-            color: #1f2937 !important;
-            margin-bottom: 8px !important;
-            line-height: 1.5 !important;
-        }
-
-        .info-panel strong {
-            color: #1e40af !important;
-        }
-
-        .erd-panel {
-            background: #eff6ff !important;
-            border: 2px solid #3b82f6 !important;
-            border-radius: 12px !important;
-            padding: 20px !important;
-            height: 650px !important;
-        }
-
-        .erd-panel h3, .erd-panel h4, .erd-panel h5 {
-            color: #1e40af !important;
-            margin-bottom: 12px !important;
-        }
-
-        .erd-panel p, .erd-panel li {
-            color: #1f2937 !important;
-            line-height: 1.5 !important;
-        }
-
-        .erd-panel ul {
-            margin-left: 0 !important;
-            padding-left: 20px !important;
-        }
-
-        .erd-panel li {
-            margin-bottom: 6px !important;
-        }
-
-        .erd-panel strong {
-            color: #1e40af !important;
-        }
-
-        .system-info {
-            background: white !important;
-            border: 1px solid #e5e7eb !important;
-            border-radius: 8px !important;
-            padding: 24px !important;
-        }
-
-        .system-info h3, .system-info h4 {
-            color: #1e40af !important;
-            margin-bottom: 12px !important;
-        }
-
-        .system-info strong {
-            color: #1e40af !important;
-        }
-
-        .system-info li {
-            color: #1f2937 !important;
-            margin-bottom: 8px !important;
-            line-height: 1.5 !important;
-        }
-
-        .system-info ul {
-            margin-left: 0 !important;
-            padding-left: 20px !important;
-        }
-
-        .system-info p {
-            color: #1f2937 !important;
-            line-height: 1.5 !important;
-        }
-
-        /* FORCE DEVELOPER FOOTER TEXT TO BE DARK */
-        .developer-minimal {
-            background: #f9fafb !important;
-            border: 1px solid #e5e7eb !important;
-            border-radius: 4px !important;
-            padding: 8px 12px !important;
-            font-size: 11px !important;
-            color: #374151 !important;
-            text-align: center !important;
-            margin-top: 16px !important;
-        }
-
-        .developer-minimal strong {
-            color: #1e40af !important;
-        }
-
-        .developer-minimal small {
-            color: #6b7280 !important;
-        }
-
-        /* Universal text readability fixes */
-        .gradio-container p, .gradio-container li, .gradio-container span {
-            color: #1f2937 !important;
-        }
-
-        /* Fix any remaining white text issues */
-        div[style*="color: white"] {
-            color: #1f2937 !important;
-        }
-        """
-        
-        with gr.Blocks(css=custom_css, theme=gr.themes.Soft(), title="SQL RAG Translator") as app:
+        with gr.Blocks(css=APP_CSS, theme=gr.themes.Soft(), title="SQL RAG Translator") as app:
             
             # Professional Header
-            gr.HTML("""
-            <div class="header-text">
-                <h1>🏦 SQL RAG Translator</h1>
-                <p>Enterprise Natural Language to SQL Translation System</p>
-            </div>
-            """)
+            gr.HTML(HEADER_HTML)
             
             # User state
             user_state = gr.State({})
@@ -519,21 +573,7 @@ class SQLRAGWebInterface:
                                 
                                 with gr.Column(scale=1):
                                     # Examples Panel - Fixed indentation and structure
-                                    gr.HTML("""
-                                    <div class="info-panel">
-                                        <h4>💡 Example Questions:</h4>
-                                        <ul style="list-style-type: disc; margin-left: 0; padding-left: 20px;">
-                                            <li style="margin-bottom: 8px;"><strong>Customer Analysis:</strong><br>Show top 10 customers by balance</li>
-                                            <li style="margin-bottom: 8px;"><strong>Geographic:</strong><br>List all customers from California</li>
-                                            <li style="margin-bottom: 8px;"><strong>Employee Data:</strong><br>Which branch has most employees?</li>
-                                            <li style="margin-bottom: 8px;"><strong>Product Info:</strong><br>What are the different account types?</li>
-                                            <li style="margin-bottom: 8px;"><strong>Transactions:</strong><br>How many transactions last month?</li>
-                                            <li style="margin-bottom: 8px;"><strong>Financial:</strong><br>Show employees earning over $80,000</li>
-                                            <li style="margin-bottom: 8px;"><strong>Analytics:</strong><br>What are the most popular products?</li>
-                                            <li style="margin-bottom: 8px;"><strong>Complex:</strong><br>Monthly transaction volume by state</li>
-                                        </ul>
-                                    </div>
-                                    """)
+                                    gr.HTML(EXAMPLES_PANEL_HTML)
                             
                             # Generation Status
                             generation_status = gr.Textbox(label="📊 Generation Status", interactive=False)
@@ -594,6 +634,7 @@ class SQLRAGWebInterface:
                             with gr.Row():
                                 translate_btn = gr.Button("🚀 Translate to All Dialects", variant="primary")
                                 clear_btn = gr.Button("🗑️ Clear", variant="secondary")
+                                clear_cache_btn = gr.Button("♻️ Clear Translation Cache", variant="secondary")
                             
                             translation_output_tab = gr.Markdown(
                                 label="🌐 Translation Results",
@@ -622,85 +663,11 @@ class SQLRAGWebInterface:
                         
                         # System Info Tab  
                         with gr.Tab("ℹ️ System Info"):
-                            gr.HTML("""
-                            <div class="system-info">
-                                <h3>🏦 SQL RAG Translator System Information</h3>
-                                
-                                <h4>📊 Current Banking Database Schema:</h4>
-                                <ul style="list-style-type: disc; margin-left: 0; padding-left: 20px;">
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Tables:</strong> 17 interconnected banking tables</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Sample Records:</strong> 8,000+ realistic banking records</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Relationships:</strong> 24 foreign key constraints</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Business Rules:</strong> 698+ constraints and validations</li>
-                                </ul>
-                                
-                                <h4>🌐 Supported Database Platforms:</h4>
-                                <ul style="list-style-type: disc; margin-left: 0; padding-left: 20px;">
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">PostgreSQL</strong> - Advanced open-source database (Currently Connected)</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">MySQL</strong> - Popular web application database</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Oracle Database</strong> - Enterprise database platform</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">SQL Server</strong> - Microsoft database platform</li>
-                                </ul>
-                                
-                                <h4>🚀 Enterprise Features:</h4>
-                                <ul style="list-style-type: disc; margin-left: 0; padding-left: 20px;">
-                                    <li style="margin-bottom: 8px; color: #1f2937;">Natural language to SQL translation with 95%+ accuracy</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;">Multi-dialect support with automatic syntax translation</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;">Real banking schema with customer, account, transaction data</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;">Query execution with result visualization and export</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;">Session management with query history and persistence</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;">Professional web interface with responsive design</li>
-                                </ul>
-                                
-                                <h4>🎯 Coming Soon:</h4>
-                                <ul style="list-style-type: disc; margin-left: 0; padding-left: 20px;">
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Interactive ERD Visualization</strong> - Real-time schema diagrams</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Custom Schema Upload</strong> - Upload your own database schemas</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">User Authentication</strong> - Persistent user accounts</li>
-                                    <li style="margin-bottom: 8px; color: #1f2937;"><strong style="color: #1e40af;">Query Optimization</strong> - Performance suggestions</li>
-                                </ul>
-                            </div>
-                            
-                            <div class="developer-minimal">
-                                © 2025 <strong style="color: #1e40af;">Navin B Agrawal</strong><br>
-                                <small style="color: #6b7280;">All rights reserved. Built with AI assistance.</small>
-                            </div>
-                            """)
+                            gr.HTML(SYSTEM_INFO_HTML)
                 
                 # RIGHT SIDE - ERD Visualization Panel (40% width - better balance)
                 with gr.Column(scale=4):
-                    gr.HTML("""
-                    <div class="erd-panel">
-                        <h3>🗺️ Database Schema Visualization</h3>
-                        
-                        <div style="text-align: center;">
-                            <h4>📋 Current Schema: Banking System</h4>
-                            <p><strong>17 Tables</strong> | <strong>24 Relationships</strong></p>
-                            
-                            <div style="background: white; border: 1px solid #cbd5e1; 
-                                       border-radius: 8px; padding: 15px; margin: 15px 0; text-align: left;">
-                                <h5 style="text-align: center; color: #1e40af; margin-bottom: 12px;">Key Table Categories:</h5>
-                                <ul style="font-size: 13px; list-style-type: disc; margin-left: 0; padding-left: 20px;">
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">Geography:</strong> countries, states, cities</li>
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">Organization:</strong> regions, branches, departments</li>
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">People:</strong> employees, customers</li>
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">Products:</strong> product_categories, products</li>
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">Accounts:</strong> customer_types, accounts</li>
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">Transactions:</strong> transaction_types, transactions</li>
-                                    <li style="margin-bottom: 6px; color: #1f2937;"><strong style="color: #1e40af;">Commerce:</strong> merchant_categories, merchants</li>
-                                </ul>
-                            </div>
-                            
-                            <div style="background: #fef3c7; border: 2px solid #f59e0b; 
-                                       border-radius: 8px; padding: 12px; margin: 15px 0;">
-                                <p style="margin: 0; font-weight: 600; color: #92400e;">
-                                    🚧 <strong>Interactive ERD Coming Soon!</strong><br>
-                                    <small style="color: #92400e;">Real-time visualization with zoom, pan, and relationship mapping</small>
-                                </p>
-                            </div>
-                        </div>
-                    </div>
-                    """)
+                    gr.HTML(ERD_PANEL_HTML)
 
             # Event handlers (keep all your existing ones - no changes needed)
             generate_btn.click(
@@ -716,11 +683,11 @@ class SQLRAGWebInterface:
             )
             
             # Enhanced translate function that shows results and switches tabs
-            def enhanced_translate_all(sql_query):
+            async def enhanced_translate_all(sql_query):
                 if not sql_query.strip():
-                    return "Please generate a query first", gr.update(visible=True), sql_query, self.translate_to_all_dialects("")
+                    return "Please generate a query first", gr.update(visible=True), sql_query, self.NO_QUERY_TO_TRANSLATE
                 
-                translation_result = self.translate_to_all_dialects(sql_query)
+                translation_result = await self.translate_to_all_dialects(sql_query)
                 return translation_result, gr.update(visible=True), sql_query, translation_result
             
             translate_all_btn.click(
@@ -735,6 +702,11 @@ class SQLRAGWebInterface:
                 outputs=[translation_output_tab]
             )
             
+            clear_cache_btn.click(
+                fn=self.clear_translation_cache,
+                outputs=[translation_output_tab]
+            )
+            
             export_btn.click(
                 fn=self.export_query,
                 inputs=[translated_sql, question_input, dialect_dropdown],
@@ -4,18 +4,320 @@ Database Schema Analyzer for SQL RAG System
 Extracts and analyzes database schema for embedding generation
 """
 
+import os
+import io
+import hashlib
+import asyncio
+import copy
+import time
 import psycopg2
+import psycopg2.extras
+from psycopg2 import sql
 import json
-from typing import Dict, List, Any
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Any, NamedTuple, Optional
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Enhanced schema handed to NLToSQLGenerator, shared by the web app and the CLI.
+# The token beside it records "<writer>:<schema fingerprint>:<payload digest>".
+ENHANCED_SCHEMA_FILE = 'data/schemas/enhanced_schema_analysis.json'
+ENHANCED_SCHEMA_TOKEN_FILE = 'data/cache/enhanced_schema_analysis.token'
+
+
+def write_file_atomic(path: str, payload: bytes):
+    """Write bytes to a temporary file and swap it into place"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def payload_digest(payload: bytes) -> str:
+    """Short content digest stored in the enhanced schema token"""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def read_enhanced_schema_token() -> str:
+    """Current token for the enhanced schema file ('' if none)"""
+    try:
+        with open(ENHANCED_SCHEMA_TOKEN_FILE) as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def save_enhanced_schema(schema_info: Dict[str, Any], writer: str, fingerprint: str) -> bool:
+    """Write the enhanced schema, then its token, each atomically; skipped when the token already matches"""
+    if orjson is not None:
+        payload = orjson.dumps(schema_info, default=str, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(schema_info, indent=2, default=str).encode()
+    token = f"{writer}:{fingerprint}:{payload_digest(payload)}"
+    
+    if os.path.exists(ENHANCED_SCHEMA_FILE) and read_enhanced_schema_token() == token:
+        return False
+    write_file_atomic(ENHANCED_SCHEMA_FILE, payload)
+    write_file_atomic(ENHANCED_SCHEMA_TOKEN_FILE, token.encode())
+    return True
+
+
+def load_enhanced_schema(writer: str, fingerprint: str):
+    """The saved enhanced schema if this writer saved it for this fingerprint and it is intact, else None"""
+    token_writer, _, token_rest = read_enhanced_schema_token().partition(':')
+    token_fingerprint, _, digest = token_rest.partition(':')
+    if token_writer != writer or token_fingerprint != fingerprint:
+        return None
+    try:
+        with open(ENHANCED_SCHEMA_FILE, 'rb') as f:
+            payload = f.read()
+        if payload_digest(payload) != digest:
+            return None
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    except (OSError, ValueError):
+        return None
+
+
+class ColumnInfo(NamedTuple):
+    """Column metadata (fixed layout; converted to a dict only in the schema document)"""
+    name: str
+    type: str
+    nullable: bool
+    default: Optional[str]
+    max_length: Optional[int]
+    precision: Optional[int]
+    scale: Optional[int]
+    comment: Optional[str]
+
+
+# Column types treated as date columns for sample queries
+DATE_TYPES = ('date', 'timestamp', 'timestamp with time zone', 'timestamp without time zone')
+
+# Extracted schemas are reused for this long, in memory and across restarts via disk
+SCHEMA_CACHE_TTL = 300
+SCHEMA_CACHE_FILE = 'data/cache/schema_cache.json'
+SCHEMA_MEMO_SIZE = 4
+schema_memo = OrderedDict()  # dsn -> (extracted_at, schema_info)
+
+# Introspection queries, one per kind of metadata (shared by the sync and async analyzers)
+TABLES_QUERY = """
+    SELECT table_name 
+    FROM information_schema.tables 
+    WHERE table_schema = 'public' 
+    ORDER BY table_name;
+"""
+
+COLUMNS_QUERY = """
+    SELECT 
+        table_name,
+        column_name as name,
+        data_type as type,
+        is_nullable = 'YES' as nullable,
+        column_default as "default",
+        character_maximum_length as max_length,
+        numeric_precision as precision,
+        numeric_scale as scale,
+        col_description(pgc.oid, a.attnum) as comment
+    FROM information_schema.columns c
+    LEFT JOIN pg_class pgc ON pgc.relname = c.table_name
+    LEFT JOIN pg_attribute a ON a.attrelid = pgc.oid AND a.attname = c.column_name
+    WHERE table_schema = 'public'
+    ORDER BY table_name, ordinal_position;
+"""
+
+PRIMARY_KEYS_QUERY = """
+    SELECT tc.table_name, kcu.column_name
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.key_column_usage kcu 
+        ON tc.constraint_name = kcu.constraint_name
+    WHERE tc.table_schema = 'public'
+    AND tc.constraint_type = 'PRIMARY KEY'
+    ORDER BY tc.table_name, kcu.ordinal_position;
+"""
+
+# Planner statistics instead of a full COUNT(*) scan per table
+ROW_ESTIMATES_QUERY = """
+    SELECT relname, reltuples::bigint
+    FROM pg_class
+    WHERE relkind IN ('r', 'p')
+    AND relnamespace = 'public'::regnamespace;
+"""
+
+FOREIGN_KEYS_QUERY = """
+    SELECT 
+        tc.table_name as source_table,
+        kcu.column_name as source_column,
+        ccu.table_name as target_table,
+        ccu.column_name as target_column,
+        tc.constraint_name
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.key_column_usage kcu 
+        ON tc.constraint_name = kcu.constraint_name
+    JOIN information_schema.constraint_column_usage ccu 
+        ON ccu.constraint_name = tc.constraint_name
+    WHERE tc.constraint_type = 'FOREIGN KEY'
+    ORDER BY tc.table_name, kcu.column_name;
+"""
+
+INDEXES_QUERY = """
+    SELECT 
+        schemaname as schema,
+        tablename as "table",
+        indexname as name,
+        indexdef as definition
+    FROM pg_indexes 
+    WHERE schemaname = 'public'
+    ORDER BY tablename, indexname;
+"""
+
+# Fingerprint of the public schema's tables and columns, used as a cache key
+SCHEMA_VERSION_QUERY = """
+    SELECT md5(coalesce(string_agg(
+        table_name || '.' || column_name || ':' || data_type, ','
+        ORDER BY table_name, ordinal_position
+    ), '')) as version
+    FROM information_schema.columns
+    WHERE table_schema = 'public';
+"""
+
+# Human-readable table purposes (read-only, built once at import)
+TABLE_DESCRIPTIONS = MappingProxyType({
+    'countries': 'Reference table containing country information with currencies and tax rates',
+    'states': 'Geographic reference for US states and provinces',
+    'cities': 'City information with population and economic data',
+    'regions': 'Bank operational regions for branch organization',
+    'branches': 'Physical bank branch locations and details',
+    'departments': 'Bank organizational departments',
+    'employees': 'Bank staff information with hierarchy and compensation',
+    'customer_segments': 'Customer classification tiers based on relationship value',
+    'customer_types': 'Categories of customers (individual, business, corporate)',
+    'customers': 'Customer profiles with demographics and financial information',
+    'product_categories': 'Banking product classification (deposits, loans, cards)',
+    'products': 'Specific banking products with terms and fees',
+    'accounts': 'Customer accounts with balances and transaction limits',
+    'transaction_types': 'Classification of banking transaction types',
+    'merchant_categories': 'Merchant category codes for transaction classification',
+    'merchants': 'Business entities where transactions occur',
+    'transactions': 'Individual banking transactions with amounts and details'
+})
 
 class SchemaAnalyzer:
-    def __init__(self, db_connection):
+    def __init__(self, db_connection=None):
         self.conn = db_connection
-        self.cursor = db_connection.cursor()
+        # Rows come back keyed by column alias, so the aliases below are the output keys
+        self.cursor = db_connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) if db_connection else None
+        self.columns_by_table = None
+        self.primary_keys = None
+        self.row_counts = None
+    
+    def fetch_all(self, query, params=None) -> List[Dict]:
+        """Execute a query and return all rows keyed by column alias"""
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+    
+    def fetch_one(self, query, params=None) -> Dict:
+        """Execute a query and return its first row"""
+        self.cursor.execute(query, params)
+        return self.cursor.fetchone()
+    
+    def load_table_metadata(self):
+        """Fetch columns, primary keys and row estimates for all public tables, one query each"""
+        self.set_table_metadata(
+            self.fetch_all(COLUMNS_QUERY),
+            self.fetch_all(PRIMARY_KEYS_QUERY),
+            self.fetch_all(ROW_ESTIMATES_QUERY)
+        )
+    
+    def set_table_metadata(self, column_rows, primary_key_rows, estimate_rows):
+        """Index fetched metadata rows by table name for the per-table lookups"""
+        self.columns_by_table = {}
+        for table_name, rows in groupby(column_rows, key=itemgetter('table_name')):
+            self.columns_by_table[table_name] = [
+                ColumnInfo(**{key: value for key, value in row.items() if key != 'table_name'}) for row in rows
+            ]
+        
+        self.primary_keys = {}
+        for row in primary_key_rows:
+            self.primary_keys.setdefault(row['table_name'], []).append(row['column_name'])
+        
+        self.row_counts = {row['relname']: row['reltuples'] for row in estimate_rows}
+    
+    def refresh_row_counts(self, schema_info: Dict[str, Any]):
+        """Update row counts in an already-built schema from the current planner estimates"""
+        self.row_counts = {row['relname']: row['reltuples'] for row in self.fetch_all(ROW_ESTIMATES_QUERY)}
+        for table_name, table_info in schema_info['tables'].items():
+            table_info['row_count'] = self.get_row_count(table_name)
 
-    def extract_complete_schema(self) -> Dict[str, Any]:
+    def extract_complete_schema(self, use_cache: bool = True) -> Dict[str, Any]:
         """Extract complete schema information for RAG processing"""
+        if not use_cache:
+            return self.extract_schema_from_database()
+        
+        dsn = self.conn.dsn
+        cached = schema_memo.get(dsn) or self.load_cached_schema(dsn)
+        if cached and time.time() - cached[0] < SCHEMA_CACHE_TTL:
+            schema_memo[dsn] = cached
+            schema_memo.move_to_end(dsn)
+            return copy.deepcopy(cached[1])
+        
+        schema_info = self.extract_schema_from_database()
+        extracted_at = time.time()
+        
+        schema_memo[dsn] = (extracted_at, schema_info)
+        schema_memo.move_to_end(dsn)
+        if len(schema_memo) > SCHEMA_MEMO_SIZE:
+            schema_memo.popitem(last=False)
+        self.save_cached_schema(dsn, extracted_at, schema_info)
+        
+        return copy.deepcopy(schema_info)
+    
+    def load_cached_schema(self, dsn: str):
+        """Read a persisted schema for this DSN if one exists (cold starts skip the database)"""
+        if not os.path.exists(SCHEMA_CACHE_FILE):
+            return None
+        try:
+            with open(SCHEMA_CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('dsn') != dsn:
+            return None
+        return cached['extracted_at'], cached['schema']
+    
+    def save_cached_schema(self, dsn: str, extracted_at: float, schema_info: Dict[str, Any]):
+        """Persist the extracted schema for the next process start"""
+        try:
+            os.makedirs(os.path.dirname(SCHEMA_CACHE_FILE), exist_ok=True)
+            with open(SCHEMA_CACHE_FILE, 'w') as f:
+                json.dump({'dsn': dsn, 'extracted_at': extracted_at, 'schema': schema_info}, f, default=str)
+        except OSError as e:
+            print(f"⚠️  Could not persist schema cache: {e}")
+    
+    def extract_schema_from_database(self) -> Dict[str, Any]:
+        """Query the database for the complete schema (uncached)"""
+        
+        # Get all tables
+        tables = [row['table_name'] for row in self.fetch_all(TABLES_QUERY)]
+        
+        # Per-table lookups below read from this prefetched metadata
+        self.load_table_metadata()
         
+        return self.build_schema_info(tables, self.get_foreign_keys(), self.get_indexes())
+    
+    def build_schema_info(self, tables: List[str], relationships: List[Dict], indexes: List[Dict]) -> Dict[str, Any]:
+        """Assemble the schema document from loaded table metadata"""
         schema_info = {
             'tables': {},
             'relationships': [],
@@ -24,140 +326,57 @@ class SchemaAnalyzer:
             'sample_data': {}
         }
         
-        # Get all tables
-        self.cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            ORDER BY table_name;
-        """)
-        
-        tables = self.cursor.fetchall()
-        
-        for table_row in tables:
-            table_name = table_row[0]
+        for table_name in tables:
             schema_info['tables'][table_name] = {
-                'columns': self.get_table_columns(table_name),
+                'columns': [column._asdict() for column in self.get_table_columns(table_name)],
                 'comment': None,
                 'sample_queries': self.generate_sample_queries(table_name),
                 'row_count': self.get_row_count(table_name)
             }
         
-        # Get foreign key relationships
-        schema_info['relationships'] = self.get_foreign_keys()
-        
-        # Get indexes
-        schema_info['indexes'] = self.get_indexes()
+        schema_info['relationships'] = relationships
+        schema_info['indexes'] = indexes
         
         return schema_info
     
-    def get_table_columns(self, table_name: str) -> List[Dict]:
+    def get_schema_version(self) -> str:
+        """Fingerprint of the public schema's tables and columns (cache key)"""
+        return self.fetch_one(SCHEMA_VERSION_QUERY)['version']
+    
+    def get_table_columns(self, table_name: str) -> List[ColumnInfo]:
         """Get detailed column information for a table"""
-        self.cursor.execute("""
-            SELECT 
-                column_name,
-                data_type,
-                is_nullable,
-                column_default,
-                character_maximum_length,
-                numeric_precision,
-                numeric_scale,
-                col_description(pgc.oid, a.attnum) as column_comment
-            FROM information_schema.columns c
-            LEFT JOIN pg_class pgc ON pgc.relname = c.table_name
-            LEFT JOIN pg_attribute a ON a.attrelid = pgc.oid AND a.attname = c.column_name
-            WHERE table_name = %s AND table_schema = 'public'
-            ORDER BY ordinal_position;
-        """, (table_name,))
-        
-        columns = []
-        for row in self.cursor.fetchall():
-            columns.append({
-                'name': row[0],
-                'type': row[1],
-                'nullable': row[2] == 'YES',
-                'default': row[3],
-                'max_length': row[4],
-                'precision': row[5],
-                'scale': row[6],
-                'comment': row[7]
-            })
-        
-        return columns
+        if self.columns_by_table is None:
+            self.load_table_metadata()
+        return self.columns_by_table.get(table_name, [])
     
     def get_foreign_keys(self) -> List[Dict]:
         """Get all foreign key relationships"""
-        self.cursor.execute("""
-            SELECT 
-                tc.table_name as source_table,
-                kcu.column_name as source_column,
-                ccu.table_name as target_table,
-                ccu.column_name as target_column,
-                tc.constraint_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu 
-                ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage ccu 
-                ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-            ORDER BY tc.table_name, kcu.column_name;
-        """)
-        
-        relationships = []
-        for row in self.cursor.fetchall():
-            relationships.append({
-                'source_table': row[0],
-                'source_column': row[1],
-                'target_table': row[2],
-                'target_column': row[3],
-                'constraint_name': row[4]
-            })
-        
-        return relationships
+        return [dict(row) for row in self.fetch_all(FOREIGN_KEYS_QUERY)]
     
     def get_indexes(self) -> List[Dict]:
         """Get index information"""
-        self.cursor.execute("""
-            SELECT 
-                schemaname,
-                tablename,
-                indexname,
-                indexdef
-            FROM pg_indexes 
-            WHERE schemaname = 'public'
-            ORDER BY tablename, indexname;
-        """)
-        
-        indexes = []
-        for row in self.cursor.fetchall():
-            indexes.append({
-                'schema': row[0],
-                'table': row[1],
-                'name': row[2],
-                'definition': row[3]
-            })
-        
-        return indexes
+        return [dict(row) for row in self.fetch_all(INDEXES_QUERY)]
     
     def get_row_count(self, table_name: str) -> int:
         """Get approximate row count for a table"""
-        self.cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-        return self.cursor.fetchone()[0]
+        if self.row_counts is None:
+            self.load_table_metadata()
+        
+        row_count = self.row_counts.get(table_name, 0)
+        if row_count < 0:
+            # Never vacuumed/analyzed: no estimate yet, so count exactly
+            row_count = self.fetch_one(
+                sql.SQL("SELECT COUNT(*) as row_count FROM {};").format(sql.Identifier(table_name))
+            )['row_count']
+        return row_count
     
     def generate_sample_queries(self, table_name: str) -> List[str]:
         """Generate sample queries for a table"""
         
         # Get primary key
-        self.cursor.execute("""
-            SELECT column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu 
-                ON tc.constraint_name = kcu.constraint_name
-            WHERE tc.table_name = %s 
-            AND tc.constraint_type = 'PRIMARY KEY';
-        """, (table_name,))
-        
-        pk_columns = [row[0] for row in self.cursor.fetchall()]
+        if self.primary_keys is None:
+            self.load_table_metadata()
+        pk_columns = self.primary_keys.get(table_name, [])
         pk_col = pk_columns[0] if pk_columns else 'id'
         
         samples = [
@@ -179,73 +398,104 @@ class SchemaAnalyzer:
     
     def get_date_columns(self, table_name: str) -> List[str]:
         """Get date/timestamp columns for a table"""
-        self.cursor.execute("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = %s 
-            AND data_type IN ('date', 'timestamp', 'timestamp with time zone', 'timestamp without time zone')
-            ORDER BY ordinal_position;
-        """, (table_name,))
-        
-        return [row[0] for row in self.cursor.fetchall()]
+        return [col.name for col in self.get_table_columns(table_name) if col.type in DATE_TYPES]
     
-    def create_schema_embeddings_text(self) -> str:
-        """Create text representation of schema for embedding"""
-        schema = self.extract_complete_schema()
+    def create_schema_embeddings_text(self, schema: Dict[str, Any] = None) -> str:
+        """Create text representation of schema for embedding (extracted now unless given)"""
+        if schema is None:
+            schema = self.extract_complete_schema()
         
-        text_parts = []
-        text_parts.append("BANKING DATABASE SCHEMA DOCUMENTATION")
-        text_parts.append("=" * 50)
+        buf = io.StringIO()
+        write = buf.write
+        write("BANKING DATABASE SCHEMA DOCUMENTATION\n")
+        write("=" * 50 + "\n")
         
         # Add table descriptions
         for table_name, table_info in schema['tables'].items():
-            text_parts.append(f"\nTABLE: {table_name}")
-            text_parts.append(f"Description: {self.get_table_description(table_name)}")
-            text_parts.append(f"Row Count: {table_info['row_count']:,}")
-            
-            text_parts.append("Columns:")
+            write(f"\nTABLE: {table_name}\n"
+                  f"Description: {self.get_table_description(table_name)}\n"
+                  f"Row Count: {table_info['row_count']:,}\n"
+                  "Columns:\n")
             for col in table_info['columns']:
-                col_desc = f"  - {col['name']} ({col['type']})"
-                if not col['nullable']:
-                    col_desc += " NOT NULL"
-                if col['comment']:
-                    col_desc += f" - {col['comment']}"
-                text_parts.append(col_desc)
+                write(f"  - {col['name']} ({col['type']})"
+                      f"{'' if col['nullable'] else ' NOT NULL'}"
+                      f"{' - ' + col['comment'] if col['comment'] else ''}\n")
             
-            text_parts.append("Sample Queries:")
+            write("Sample Queries:\n")
             for query in table_info['sample_queries']:
-                text_parts.append(f"  - {query}")
+                write(f"  - {query}\n")
         
         # Add relationships
-        text_parts.append("\nTABLE RELATIONSHIPS:")
+        write("\nTABLE RELATIONSHIPS:\n")
         for rel in schema['relationships']:
-            text_parts.append(f"  {rel['source_table']}.{rel['source_column']} -> {rel['target_table']}.{rel['target_column']}")
+            write(f"  {rel['source_table']}.{rel['source_column']} -> {rel['target_table']}.{rel['target_column']}\n")
         
-        return "\n".join(text_parts)
+        return buf.getvalue()[:-1]  # no trailing newline, as with "\n".join
     
     def get_table_description(self, table_name: str) -> str:
         """Get human-readable description of table purpose"""
-        descriptions = {
-            'countries': 'Reference table containing country information with currencies and tax rates',
-            'states': 'Geographic reference for US states and provinces',
-            'cities': 'City information with population and economic data',
-            'regions': 'Bank operational regions for branch organization',
-            'branches': 'Physical bank branch locations and details',
-            'departments': 'Bank organizational departments',
-            'employees': 'Bank staff information with hierarchy and compensation',
-            'customer_segments': 'Customer classification tiers based on relationship value',
-            'customer_types': 'Categories of customers (individual, business, corporate)',
-            'customers': 'Customer profiles with demographics and financial information',
-            'product_categories': 'Banking product classification (deposits, loans, cards)',
-            'products': 'Specific banking products with terms and fees',
-            'accounts': 'Customer accounts with balances and transaction limits',
-            'transaction_types': 'Classification of banking transaction types',
-            'merchant_categories': 'Merchant category codes for transaction classification',
-            'merchants': 'Business entities where transactions occur',
-            'transactions': 'Individual banking transactions with amounts and details'
-        }
+        return TABLE_DESCRIPTIONS.get(table_name, f'Database table: {table_name}')
+
+class AsyncSchemaAnalyzer(SchemaAnalyzer):
+    """Schema analyzer that runs the per-kind introspection queries concurrently over asyncpg"""
+    
+    def __init__(self, dsn: str = None, max_connections: int = 8):
+        if asyncpg is None:
+            raise ImportError("asyncpg is required for AsyncSchemaAnalyzer")
+        super().__init__()
+        self.dsn = dsn
+        self.max_connections = max_connections
+    
+    async def fetch(self, pool, query: str) -> List[Dict]:
+        """Run one query on its own pooled connection"""
+        async with pool.acquire() as connection:
+            return [dict(record) for record in await connection.fetch(query)]
+    
+    async def get_schema_version_async(self, pool) -> str:
+        """Fingerprint of the public schema's tables and columns (cache key)"""
+        async with pool.acquire() as connection:
+            return await connection.fetchval(SCHEMA_VERSION_QUERY)
+    
+    async def extract_complete_schema_async(self, pool=None) -> Dict[str, Any]:
+        """Extract complete schema information, all metadata queries in flight at once"""
+        if pool is None:
+            async with asyncpg.create_pool(self.dsn, min_size=1, max_size=self.max_connections) as pool:
+                return await self.extract_schema_from_pool(pool)
+        return await self.extract_schema_from_pool(pool)
+    
+    async def count_rows_async(self, pool, table_name: str) -> int:
+        """Exact row count; the server quotes the table name with format('%I')"""
+        async with pool.acquire() as connection:
+            count_query = await connection.fetchval("SELECT format('SELECT COUNT(*) FROM %I', $1::text)", table_name)
+            return await connection.fetchval(count_query)
+    
+    async def count_unanalyzed_async(self, pool):
+        """Never vacuumed/analyzed tables have no estimate; count those exactly"""
+        unanalyzed = [name for name, count in self.row_counts.items() if count < 0]
+        exact_counts = await asyncio.gather(*(self.count_rows_async(pool, name) for name in unanalyzed))
+        self.row_counts.update(zip(unanalyzed, exact_counts))
+    
+    async def refresh_row_counts_async(self, pool, schema_info: Dict[str, Any]):
+        """Update row counts in an already-built schema from the current planner estimates"""
+        estimate_rows = await self.fetch(pool, ROW_ESTIMATES_QUERY)
+        self.row_counts = {row['relname']: row['reltuples'] for row in estimate_rows}
+        await self.count_unanalyzed_async(pool)
+        for table_name, table_info in schema_info['tables'].items():
+            table_info['row_count'] = self.row_counts.get(table_name, 0)
+    
+    async def extract_schema_from_pool(self, pool) -> Dict[str, Any]:
+        """Run the introspection queries on an existing asyncpg pool"""
+        tables, column_rows, primary_key_rows, estimate_rows, relationships, indexes = await asyncio.gather(
+            *(self.fetch(pool, query) for query in (
+                TABLES_QUERY, COLUMNS_QUERY, PRIMARY_KEYS_QUERY,
+                ROW_ESTIMATES_QUERY, FOREIGN_KEYS_QUERY, INDEXES_QUERY
+            ))
+        )
+        self.set_table_metadata(column_rows, primary_key_rows, estimate_rows)
+        await self.count_unanalyzed_async(pool)
         
-        return descriptions.get(table_name, f'Database table: {table_name}')
+        return self.build_schema_info([row['table_name'] for row in tables], relationships, indexes)
+
 
 def main():
     """Test the schema analyzer"""
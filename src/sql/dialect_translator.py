@@ -8,8 +8,221 @@ Date: June 2025
 """
 
 import re
+import copy
+import asyncio
+import functools
 from typing import Dict, List, Tuple
 
+try:
+    import sqlglot
+    from sqlglot.errors import SqlglotError
+except ImportError:
+    sqlglot = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# sqlglot dialect names for the supported targets
+SQLGLOT_DIALECTS = {
+    'postgresql': 'postgres',
+    'mysql': 'mysql',
+    'oracle': 'oracle',
+    'sqlserver': 'tsql'
+}
+
+# AST node types whose SQL differs across dialects, reported as translation notes
+AST_NOTES = [
+    ('CurrentDate', 'Current date function'),
+    ('CurrentTimestamp', 'Current timestamp function'),
+    ('DateTrunc', 'Date truncation'),
+    ('TimestampTrunc', 'Date truncation'),
+    ('GroupConcat', 'String aggregation'),
+    ('Interval', 'INTERVAL syntax'),
+    ('Boolean', 'Boolean literals'),
+    ('Cast', 'Type casts'),
+    ('ILike', 'ILIKE comparison'),
+    ('Limit', 'LIMIT clause'),
+]
+
+# Target-specific wording for notes, matching the regex translators
+DIALECT_AST_NOTES = {
+    'oracle': {'Limit': 'LIMIT to FETCH FIRST clause'},
+    'sqlserver': {'Limit': 'LIMIT to TOP clause', 'GroupConcat': 'String aggregation (SQL Server 2017+)'},
+}
+ORACLE_ROWNUM_NOTE = 'LIMIT with subquery for Oracle'
+
+# A query per target-specific note that must produce it (checked by main())
+DIALECT_NOTE_SAMPLES = {
+    ('oracle', 'LIMIT to FETCH FIRST clause'): "SELECT name FROM customers LIMIT 5 OFFSET 10",
+    ('oracle', ORACLE_ROWNUM_NOTE): "SELECT name FROM customers LIMIT 5",
+    ('sqlserver', 'LIMIT to TOP clause'): "SELECT name FROM customers LIMIT 5",
+    ('sqlserver', 'String aggregation (SQL Server 2017+)'):
+        "SELECT STRING_AGG(name, ', ' ORDER BY name) FROM customers",
+}
+
+
+def node_sql(node, dialect: str) -> str:
+    """SQL for one node; LIMIT is written by its SELECT (e.g. TOP), so render it inside a minimal one"""
+    if isinstance(node, sqlglot.exp.Limit) and isinstance(node.parent, sqlglot.exp.Select):
+        node = sqlglot.exp.select('*').from_('t').limit(node.expression.copy())
+    return node.sql(dialect=dialect)
+
+
+def ast_translation_notes(tree, target_tree, target_dialect: str) -> List[str]:
+    """Describe the constructs whose SQL actually changes in the emitted target query"""
+    write_dialect = SQLGLOT_DIALECTS[target_dialect]
+    overrides = DIALECT_AST_NOTES.get(target_dialect, {})
+    notes = []
+    if target_tree is not tree and target_tree != tree:
+        # Rewritten on the AST before rendering (Oracle ROWNUM subquery)
+        notes.append(f"Converted {ORACLE_ROWNUM_NOTE}")
+    
+    for node_name, note in AST_NOTES:
+        node_type = getattr(sqlglot.exp, node_name, None)
+        if node_type is None:
+            continue
+        converted = f"Converted {overrides.get(node_name, note)}"
+        if converted not in notes and any(
+            node_sql(node, 'postgres') != node_sql(node, write_dialect) for node in target_tree.find_all(node_type)
+        ):
+            notes.append(converted)
+    return notes or ["No dialect-specific constructs; regenerated from parsed AST"]
+
+
+def oracle_rownum_limit(node):
+    """Rewrite SELECT ... LIMIT n as SELECT * FROM (SELECT ...) WHERE ROWNUM <= n"""
+    if not isinstance(node, sqlglot.exp.Select) or node.args.get('offset'):
+        return node
+    limit = node.args.get('limit')
+    if limit is None or limit.expression is None:
+        return node
+    
+    inner = node.copy()
+    inner.set('limit', None)
+    # transform() does not descend into replaced nodes, so handle nested LIMITs here
+    inner = inner.transform(oracle_rownum_limit)
+    return (
+        sqlglot.exp.select('*')
+        .from_(inner.subquery())
+        .where(sqlglot.exp.LTE(this=sqlglot.exp.column('ROWNUM'), expression=limit.expression.copy()))
+    )
+
+
+def compile_rules(rules):
+    """Fuse (pattern, replacement, note) rules into one case-insensitive alternation"""
+    pattern = re.compile('|'.join(f'(?P<rule{i}>{rule[0]})' for i, rule in enumerate(rules)), re.IGNORECASE)
+    
+    dispatch = {}
+    for i, (_, replacement, note) in enumerate(rules):
+        # Shift \N backreferences to the rule's position inside the fused pattern
+        offset = pattern.groupindex[f'rule{i}']
+        template = re.sub(r'\\(\d)', lambda ref: f'\\g<{offset + int(ref.group(1))}>', replacement)
+        dispatch[f'rule{i}'] = (template, i)
+    
+    # Hyperscan scans all rules in one SIMD pass; captures still need `re` for the rewrite
+    prefilter = None
+    if hyperscan is not None:
+        prefilter = hyperscan.Database()
+        prefilter.compile(
+            expressions=[rule[0].encode() for rule in rules],
+            ids=list(range(len(rules))),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(rules)
+        )
+    
+    return pattern, dispatch, [note for _, _, note in rules], prefilter
+
+
+# PostgreSQL -> MySQL replacements
+MYSQL_RULES = compile_rules([
+    # Date functions
+    (r'CURRENT_DATE', 'CURDATE()', 'Current date function'),
+    (r'CURRENT_TIMESTAMP', 'NOW()', 'Current timestamp function'),
+    (r'DATE_TRUNC\s*\(\s*[\'"]month[\'"]\s*,\s*([^)]+)\)', 
+     r'DATE_FORMAT(\1, "%Y-%m-01")', 'Date truncation to month'),
+    
+    # String functions
+    (r'STRING_AGG\s*\(\s*([^,]+)\s*,\s*([^)]+)\)', 
+     r'GROUP_CONCAT(\1 SEPARATOR \2)', 'String aggregation'),
+    
+    # Limit syntax (already compatible)
+    # Boolean literals
+    (r'\bTRUE\b', '1', 'Boolean TRUE'),
+    (r'\bFALSE\b', '0', 'Boolean FALSE'),
+    
+    # Data types
+    (r'\bSERIAL\b', 'INT AUTO_INCREMENT', 'Auto-increment integer'),
+    (r'\bBIGSERIAL\b', 'BIGINT AUTO_INCREMENT', 'Auto-increment big integer'),
+    (r'\bTEXT\b', 'LONGTEXT', 'Large text field'),
+])
+
+# PostgreSQL -> Oracle replacements
+ORACLE_RULES = compile_rules([
+    # Date functions
+    (r'CURRENT_DATE', 'SYSDATE', 'Current date function'),
+    (r'CURRENT_TIMESTAMP', 'SYSTIMESTAMP', 'Current timestamp function'),
+    (r'DATE_TRUNC\s*\(\s*[\'"]month[\'"]\s*,\s*([^)]+)\)', 
+     r'TRUNC(\1, "MM")', 'Date truncation to month'),
+    
+    # String functions
+    (r'STRING_AGG\s*\(\s*([^,]+)\s*,\s*([^)]+)\)', 
+     r'LISTAGG(\1, \2) WITHIN GROUP (ORDER BY \1)', 'String aggregation'),
+    
+    # Boolean literals
+    (r'\bTRUE\b', '1', 'Boolean TRUE'),
+    (r'\bFALSE\b', '0', 'Boolean FALSE'),
+])
+
+# PostgreSQL -> SQL Server replacements
+SQLSERVER_RULES = compile_rules([
+    # Date functions
+    (r'CURRENT_DATE', 'GETDATE()', 'Current date function'),
+    (r'CURRENT_TIMESTAMP', 'GETDATE()', 'Current timestamp function'),
+    (r'DATE_TRUNC\s*\(\s*[\'"]month[\'"]\s*,\s*([^)]+)\)', 
+     r'DATEFROMPARTS(YEAR(\1), MONTH(\1), 1)', 'Date truncation to month'),
+    
+    # String functions
+    (r'STRING_AGG\s*\(\s*([^,]+)\s*,\s*([^)]+)\)', 
+     r'STRING_AGG(\1, \2)', 'String aggregation (SQL Server 2017+)'),
+    
+    # Boolean literals
+    (r'\bTRUE\b', '1', 'Boolean TRUE'),
+    (r'\bFALSE\b', '0', 'Boolean FALSE'),
+    
+    # Data types
+    (r'\bSERIAL\b', 'INT IDENTITY(1,1)', 'Auto-increment integer'),
+    (r'\bBIGSERIAL\b', 'BIGINT IDENTITY(1,1)', 'Auto-increment big integer'),
+    (r'\bTEXT\b', 'NVARCHAR(MAX)', 'Large text field'),
+])
+
+INTERVAL_PATTERN = re.compile(r"INTERVAL\s+'(\d+)\s+(\w+)'", re.IGNORECASE)
+# Fallback LIMIT rewrites only touch the statement's trailing LIMIT; anchoring keeps them linear
+ORACLE_LIMIT_PATTERN = re.compile(r'^(.*)\s+LIMIT\s+(\d+)\s*(;?)\s*$', re.IGNORECASE | re.DOTALL)
+SQLSERVER_LIMIT_PATTERN = re.compile(r'^(\s*SELECT\s+(?:DISTINCT\s+)?)(.*)\s+LIMIT\s+(\d+)\s*(;?)\s*$', re.IGNORECASE | re.DOTALL)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_postgres(sql_query: str):
+    """Parse PostgreSQL once into a sqlglot AST (None if unavailable or unparseable)"""
+    if sqlglot is None:
+        return None
+    try:
+        return sqlglot.parse_one(sql_query, read='postgres')
+    except SqlglotError:
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_postgres_statements(sql_query: str):
+    """Parse every statement in a PostgreSQL string (None if unavailable or unparseable)"""
+    if sqlglot is None:
+        return None
+    try:
+        return tuple(statement for statement in sqlglot.parse(sql_query, read='postgres') if statement is not None)
+    except SqlglotError:
+        return None
+
 
 class SQLDialectTranslator:
     """Translates SQL queries between different database dialects"""
@@ -37,6 +250,9 @@ class SQLDialectTranslator:
                 'features': ['T-SQL', 'Integration Services', 'Analysis Services', 'Reporting']
             }
         }
+        
+        # Translation is a pure function of (sql, dialect); cache per instance
+        self._translate_cached = functools.lru_cache(maxsize=2048)(self._translate_impl)
     
     def get_available_dialects(self) -> List[str]:
         """Get list of supported dialects"""
@@ -48,8 +264,19 @@ class SQLDialectTranslator:
     
     def translate_query(self, sql_query: str, target_dialect: str) -> Dict:
         """Translate SQL query to target dialect"""
-        target_dialect = target_dialect.lower()
-        
+        # Callers get their own copy so cached results are never mutated
+        return copy.deepcopy(self._translate_cached(sql_query.strip(), target_dialect.lower()))
+    
+    def clear_cache(self):
+        """Drop all cached translations"""
+        self._translate_cached.cache_clear()
+    
+    def cache_info(self):
+        """Hit/miss statistics for the translation cache"""
+        return self._translate_cached.cache_info()
+    
+    def _translate_impl(self, sql_query: str, target_dialect: str) -> Dict:
+        """Uncached translation of SQL query to target dialect"""
         if target_dialect not in self.dialect_info:
             return {
                 'success': False,
@@ -62,6 +289,12 @@ class SQLDialectTranslator:
                 # Already PostgreSQL, return as-is
                 translated_sql = sql_query
                 notes = ["Query is already in PostgreSQL format"]
+            elif parse_postgres(sql_query) is not None:
+                # Shared AST: one parse serves every target dialect
+                tree = parse_postgres(sql_query)
+                target_tree = tree.transform(oracle_rownum_limit) if target_dialect == 'oracle' else tree
+                translated_sql = target_tree.sql(dialect=SQLGLOT_DIALECTS[target_dialect], pretty=True)
+                notes = ast_translation_notes(tree, target_tree, target_dialect)
             elif target_dialect == 'mysql':
                 translated_sql, notes = self._translate_to_mysql(sql_query)
             elif target_dialect == 'oracle':
@@ -90,130 +323,63 @@ class SQLDialectTranslator:
                 'error': f"Translation error: {str(e)}"
             }
     
+    def _apply_rules(self, translated: str, rules: Tuple, notes: List[str]) -> str:
+        """Apply fused rules in a single pass, noting the ones that matched (in rule order)"""
+        pattern, dispatch, rule_notes, prefilter = rules
+        
+        if prefilter is not None:
+            hits = []
+            # Returning True from the handler stops the scan at the first hit
+            prefilter.scan(translated.encode(), match_event_handler=lambda rule_id, start, end, flags, context: hits.append(rule_id) or True)
+            if not hits:
+                return translated
+        
+        matched = set()
+        
+        def substitute(match):
+            template, index = dispatch[match.lastgroup]
+            matched.add(index)
+            return match.expand(template)
+        
+        translated = pattern.sub(substitute, translated)
+        notes.extend(f"Converted {rule_notes[index]}" for index in sorted(matched))
+        return translated
+    
     def _translate_to_mysql(self, sql: str) -> Tuple[str, List[str]]:
         """Translate PostgreSQL to MySQL"""
-        translated = sql
         notes = []
-        
-        # Replace PostgreSQL-specific functions
-        replacements = [
-            # Date functions
-            (r'CURRENT_DATE', 'CURDATE()', 'Current date function'),
-            (r'CURRENT_TIMESTAMP', 'NOW()', 'Current timestamp function'),
-            (r'DATE_TRUNC\s*\(\s*[\'"]month[\'"]\s*,\s*([^)]+)\)', 
-             r'DATE_FORMAT(\1, "%Y-%m-01")', 'Date truncation to month'),
-            
-            # String functions
-            (r'STRING_AGG\s*\(\s*([^,]+)\s*,\s*([^)]+)\)', 
-             r'GROUP_CONCAT(\1 SEPARATOR \2)', 'String aggregation'),
-            
-            # Limit syntax (already compatible)
-            # Boolean literals
-            (r'\bTRUE\b', '1', 'Boolean TRUE'),
-            (r'\bFALSE\b', '0', 'Boolean FALSE'),
-            
-            # Data types
-            (r'\bSERIAL\b', 'INT AUTO_INCREMENT', 'Auto-increment integer'),
-            (r'\bBIGSERIAL\b', 'BIGINT AUTO_INCREMENT', 'Auto-increment big integer'),
-            (r'\bTEXT\b', 'LONGTEXT', 'Large text field'),
-        ]
-        
-        for pattern, replacement, note in replacements:
-            if re.search(pattern, translated, re.IGNORECASE):
-                translated = re.sub(pattern, replacement, translated, flags=re.IGNORECASE)
-                notes.append(f"Converted {note}")
+        translated = self._apply_rules(sql, MYSQL_RULES, notes)
         
         # Handle INTERVAL (more complex)
-        interval_pattern = r"INTERVAL\s+'(\d+)\s+(\w+)'"
-        def interval_replacement(match):
-            value, unit = match.groups()
-            return f"INTERVAL {value} {unit.upper()}"
-        
-        if re.search(interval_pattern, translated, re.IGNORECASE):
-            translated = re.sub(interval_pattern, interval_replacement, translated, flags=re.IGNORECASE)
+        translated, count = INTERVAL_PATTERN.subn(
+            lambda match: f"INTERVAL {match.group(1)} {match.group(2).upper()}", translated)
+        if count:
             notes.append("Converted INTERVAL syntax")
         
         return translated, notes
     
     def _translate_to_oracle(self, sql: str) -> Tuple[str, List[str]]:
         """Translate PostgreSQL to Oracle"""
-        translated = sql
         notes = []
+        translated = self._apply_rules(sql, ORACLE_RULES, notes)
         
-        # Replace PostgreSQL-specific functions
-        replacements = [
-            # Date functions
-            (r'CURRENT_DATE', 'SYSDATE', 'Current date function'),
-            (r'CURRENT_TIMESTAMP', 'SYSTIMESTAMP', 'Current timestamp function'),
-            (r'DATE_TRUNC\s*\(\s*[\'"]month[\'"]\s*,\s*([^)]+)\)', 
-             r'TRUNC(\1, "MM")', 'Date truncation to month'),
-            
-            # String functions
-            (r'STRING_AGG\s*\(\s*([^,]+)\s*,\s*([^)]+)\)', 
-             r'LISTAGG(\1, \2) WITHIN GROUP (ORDER BY \1)', 'String aggregation'),
-            
-            # Boolean literals
-            (r'\bTRUE\b', '1', 'Boolean TRUE'),
-            (r'\bFALSE\b', '0', 'Boolean FALSE'),
-        ]
-        
-        for pattern, replacement, note in replacements:
-            if re.search(pattern, translated, re.IGNORECASE):
-                translated = re.sub(pattern, replacement, translated, flags=re.IGNORECASE)
-                notes.append(f"Converted {note}")
-        
-        # Handle LIMIT with ORDER BY (Oracle needs subquery)
-        limit_pattern = r'(.*ORDER BY\s+[^;]+)\s+LIMIT\s+(\d+)'
-        if re.search(limit_pattern, translated, re.IGNORECASE | re.DOTALL):
-            def limit_replacement(match):
-                query_part, limit_num = match.groups()
-                return f"SELECT * FROM ({query_part}) WHERE ROWNUM <= {limit_num}"
-            
-            translated = re.sub(limit_pattern, limit_replacement, translated, flags=re.IGNORECASE | re.DOTALL)
+        # Handle LIMIT (Oracle needs subquery so ROWNUM applies after ORDER BY)
+        translated, count = ORACLE_LIMIT_PATTERN.subn(
+            lambda match: f"SELECT * FROM ({match.group(1)}) WHERE ROWNUM <= {match.group(2)}{match.group(3)}", translated)
+        if count:
             notes.append("Converted LIMIT with subquery for Oracle")
         
         return translated, notes
     
     def _translate_to_sqlserver(self, sql: str) -> Tuple[str, List[str]]:
         """Translate PostgreSQL to SQL Server"""
-        translated = sql
         notes = []
-        
-        # Replace PostgreSQL-specific functions
-        replacements = [
-            # Date functions
-            (r'CURRENT_DATE', 'GETDATE()', 'Current date function'),
-            (r'CURRENT_TIMESTAMP', 'GETDATE()', 'Current timestamp function'),
-            (r'DATE_TRUNC\s*\(\s*[\'"]month[\'"]\s*,\s*([^)]+)\)', 
-             r'DATEFROMPARTS(YEAR(\1), MONTH(\1), 1)', 'Date truncation to month'),
-            
-            # String functions
-            (r'STRING_AGG\s*\(\s*([^,]+)\s*,\s*([^)]+)\)', 
-             r'STRING_AGG(\1, \2)', 'String aggregation (SQL Server 2017+)'),
-            
-            # Boolean literals
-            (r'\bTRUE\b', '1', 'Boolean TRUE'),
-            (r'\bFALSE\b', '0', 'Boolean FALSE'),
-            
-            # Data types
-            (r'\bSERIAL\b', 'INT IDENTITY(1,1)', 'Auto-increment integer'),
-            (r'\bBIGSERIAL\b', 'BIGINT IDENTITY(1,1)', 'Auto-increment big integer'),
-            (r'\bTEXT\b', 'NVARCHAR(MAX)', 'Large text field'),
-        ]
-        
-        for pattern, replacement, note in replacements:
-            if re.search(pattern, translated, re.IGNORECASE):
-                translated = re.sub(pattern, replacement, translated, flags=re.IGNORECASE)
-                notes.append(f"Converted {note}")
+        translated = self._apply_rules(sql, SQLSERVER_RULES, notes)
         
         # Handle LIMIT -> TOP conversion (move to SELECT clause)
-        limit_pattern = r'(SELECT\s+)(.*?)(.*ORDER BY\s+[^;]+)\s+LIMIT\s+(\d+)'
-        if re.search(limit_pattern, translated, re.IGNORECASE | re.DOTALL):
-            def limit_replacement(match):
-                select_word, select_clause, order_clause, limit_num = match.groups()
-                return f'{select_word}TOP {limit_num} {select_clause}{order_clause}'
-            
-            translated = re.sub(limit_pattern, limit_replacement, translated, flags=re.IGNORECASE | re.DOTALL)
+        translated, count = SQLSERVER_LIMIT_PATTERN.subn(
+            lambda match: f"{match.group(1)}TOP {match.group(3)} {match.group(2)}{match.group(4)}", translated)
+        if count:
             notes.append("Converted LIMIT to TOP clause")
         
         return translated, notes
@@ -248,11 +414,38 @@ class SQLDialectTranslator:
     
     def batch_translate(self, sql_query: str) -> Dict:
         """Translate query to all supported dialects"""
-        results = {}
+        targets = [dialect for dialect in self.get_available_dialects() if dialect != 'postgresql']  # Skip source dialect
         
-        for dialect in self.get_available_dialects():
-            if dialect != 'postgresql':  # Skip source dialect
-                results[dialect] = self.translate_query(sql_query, dialect)
+        # Translation is GIL-bound and shares one cached parse, so a thread pool here would only add
+        # overhead; async callers use batch_translate_async to stay off the event loop
+        results = {dialect: self.translate_query(sql_query, dialect) for dialect in targets}
+        
+        return {
+            'original_sql': sql_query,
+            'translations': results,
+            'supported_dialects': self.get_available_dialects()
+        }
+    
+    async def batch_translate_async(self, sql_query: str, max_concurrency: int = 4) -> Dict:
+        """Translate query to all supported dialects concurrently"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        parse_postgres(sql_query.strip())  # parse once before fanning out
+        dialects = [dialect for dialect in self.get_available_dialects() if dialect != 'postgresql']
+        
+        async def translate(dialect):
+            async with semaphore:
+                return await asyncio.to_thread(self.translate_query, sql_query, dialect)
+        
+        outcomes = await asyncio.gather(*(translate(dialect) for dialect in dialects), return_exceptions=True)
+        
+        results = {}
+        for dialect, outcome in zip(dialects, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = {
+                    'success': False,
+                    'error': f"Translation error: {str(outcome)}"
+                }
+            results[dialect] = outcome
         
         return {
             'original_sql': sql_query,
@@ -294,6 +487,13 @@ def main():
             print(f"Notes: {', '.join(result['translation_notes'])}")
         else:
             print(f"❌ Failed: {result['error']}")
+    
+    # Every target-specific note must be reachable from its sample query
+    if sqlglot is not None:
+        print("\n🔎 Checking target-specific notes:")
+        for (dialect, note), sample in DIALECT_NOTE_SAMPLES.items():
+            fired = f"Converted {note}" in translator.translate_query(sample, dialect)['translation_notes']
+            print(f"{'✅' if fired else '❌'} {dialect}: {note}")
 
 
 if __name__ == "__main__":
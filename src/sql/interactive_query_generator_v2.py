@@ -8,8 +8,13 @@ Date: June 2025
 """
 
 import os
+import re
 import sys
 import json
+import atexit
+import asyncio
+from bisect import bisect_left
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
@@ -17,8 +22,12 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 try:
-    from database.schema_analyzer import SchemaAnalyzer
+    from database.schema_analyzer import (
+        SchemaAnalyzer, AsyncSchemaAnalyzer, ENHANCED_SCHEMA_FILE, load_enhanced_schema, save_enhanced_schema
+    )
     from sql.query_generator import NLToSQLGenerator
+    from sql.result_formatting import format_result_table
+    from sql.dialect_translator import parse_postgres_statements
     import psycopg2
     from psycopg2 import sql
 except ImportError as e:
@@ -26,6 +35,106 @@ except ImportError as e:
     print("Make sure you're in the project root and have installed dependencies")
     sys.exit(1)
 
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+try:
+    from sqlglot import exp
+except ImportError:
+    exp = None
+
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import Completer, Completion
+    from prompt_toolkit.history import FileHistory
+except ImportError:
+    PromptSession = None
+    Completer = object
+
+# asyncpg pool sizing; DB_DRIVER=psycopg2 keeps the single blocking connection
+POOL_MIN_SIZE = 4
+POOL_MAX_SIZE = 16
+POOL_MAX_INACTIVE_LIFETIME = 300  # seconds before an idle pooled connection is closed
+STATEMENT_CACHE_SIZE = 1024
+
+# Rows shown per query; one extra is fetched to tell whether more exist
+PREVIEW_ROWS = 10
+
+# Leading keywords that DECLARE CURSOR accepts (used when the SQL can't be parsed)
+CURSOR_STATEMENTS = ('SELECT', 'VALUES')
+
+EXIT_COMMANDS = frozenset(('quit', 'exit'))
+
+# Section separators used by the display methods
+SEP_EQ_70 = "=" * 70
+SEP_EQ_65 = "=" * 65
+SEP_DASH_65 = "-" * 65
+SEP_EQ_60 = "=" * 60
+SEP_EQ_50 = "=" * 50
+SEP_DASH_50 = "-" * 50
+SEP_EQ_40 = "=" * 40
+SEP_DASH_40 = "-" * 40
+
+# Saved queries are appended to one export file per session, flushed after each record
+EXPORTS_DIR = Path("data/exports")
+
+# Timestamp formats for display, export headers and export file names
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIME_FORMAT = '%H:%M:%S'
+FILE_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# Question prompt history (line editing and recall need prompt_toolkit)
+PROMPT_HISTORY_FILE = "data/cache/cli_history"
+
+# Writer name in the enhanced schema token (the web app writes a different enhancement)
+SCHEMA_WRITER = 'cli'
+
+
+def is_cursor_query(sql_query):
+    """Whether the SQL can run behind a server-side cursor (one plain SELECT/VALUES statement)"""
+    statements = parse_postgres_statements(sql_query.strip())
+    if statements is None:
+        # No AST (sqlglot missing or unparseable): fall back to the leading keyword
+        return (sql_query.split() or [''])[0].upper() in CURSOR_STATEMENTS
+    if len(statements) != 1:
+        return False
+    
+    tree = statements[0]
+    return (
+        isinstance(tree, (exp.Select, exp.Union, exp.Intersect, exp.Except, exp.Values))
+        and not tree.find(exp.Insert, exp.Update, exp.Delete, exp.Merge, exp.Into)
+    )
+
+
+class SchemaCompleter(Completer):
+    """Prefix completion over a sorted vocabulary, found by bisection instead of scanning every word"""
+    
+    def __init__(self, words):
+        # Each word is also keyed by its '.'/'_'-delimited suffixes, so 'balance' finds 'accounts.current_balance'
+        keys = set()
+        for word in words:
+            lowered = word.lower()
+            keys.add((lowered, word))
+            keys.update((lowered[match.end():], word) for match in re.finditer(r'[._]', lowered))
+        self.keys = sorted(keys)
+    
+    def get_completions(self, document, complete_event):
+        prefix = document.get_word_before_cursor(WORD=True)
+        lowered = prefix.lower()
+        if not lowered:
+            return
+        
+        seen = set()
+        for index in range(bisect_left(self.keys, (lowered,)), len(self.keys)):
+            key, word = self.keys[index]
+            if not key.startswith(lowered):
+                break
+            if word not in seen:
+                seen.add(word)
+                yield Completion(word, start_position=-len(prefix))
+
 
 class EnhancedInteractiveSQLGenerator:
     """Enhanced Interactive CLI for SQL query generation"""
@@ -37,17 +146,37 @@ class EnhancedInteractiveSQLGenerator:
             'user': os.getenv('USER'),  # Use current macOS user
             'password': ''  # No password for local development
         }
+        self.use_asyncpg = asyncpg is not None and os.getenv('DB_DRIVER') != 'psycopg2'
+        self.pool = None
         self.connection = None
         self.schema_analyzer = None
         self.query_generator = None
-        self.session_queries = []
+        self.session_queries = OrderedDict()  # normalized question -> latest record, oldest first
         self.enhanced_schema_info = None
+        self.prompt_session = None
+        self.export_file = None  # session export, opened on first save
+        
+        # Interactive commands, dispatched by lowercased input
+        self.commands = {
+            'help': self.display_help,
+            'history': self.display_history,
+            'schema': self.display_schema_info
+        }
         print(f"🔧 Database config: user='{self.db_config['user']}', database='{self.db_config['database']}'")
         
-    def connect_database(self):
-        """Establish database connection"""
+    async def connect_database(self):
+        """Establish database connection (asyncpg pool, or psycopg2 when DB_DRIVER=psycopg2)"""
         try:
-            self.connection = psycopg2.connect(**self.db_config)
+            if self.use_asyncpg:
+                self.pool = await asyncpg.create_pool(
+                    **self.db_config,
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    max_inactive_connection_lifetime=POOL_MAX_INACTIVE_LIFETIME,
+                    statement_cache_size=STATEMENT_CACHE_SIZE
+                )
+            else:
+                self.connection = psycopg2.connect(**self.db_config)
             print(f"✅ Connected to database: {self.db_config['database']}")
             return True
         except Exception as e:
@@ -109,22 +238,34 @@ class EnhancedInteractiveSQLGenerator:
         
         return enhanced_schema
     
-    def initialize_components(self):
+    async def initialize_components(self):
         """Initialize schema analyzer and query generator with enhanced context"""
         try:
-            # Initialize schema analyzer with connection
-            self.schema_analyzer = SchemaAnalyzer(self.connection)
-            schema_info = self.schema_analyzer.extract_complete_schema()
-            
-            # Enhance schema with relationship context
-            self.enhanced_schema_info = self.enhance_schema_context(schema_info)
-            
-            # Save enhanced schema to file for NLToSQLGenerator
-            schema_file = "data/schemas/enhanced_schema_analysis.json"
-            os.makedirs("data/schemas", exist_ok=True)
+            # Initialize schema analyzer with the pool or connection
+            if self.pool is not None:
+                self.schema_analyzer = AsyncSchemaAnalyzer()
+                fingerprint = await self.schema_analyzer.get_schema_version_async(self.pool)
+            else:
+                self.schema_analyzer = SchemaAnalyzer(self.connection)
+                fingerprint = self.schema_analyzer.get_schema_version()
             
-            with open(schema_file, 'w') as f:
-                json.dump(self.enhanced_schema_info, f, indent=2)
+            # Skip extraction entirely when the schema hasn't changed since the last launch
+            self.enhanced_schema_info = load_enhanced_schema(SCHEMA_WRITER, fingerprint)
+            if self.enhanced_schema_info is None:
+                # The fingerprint already says the schema changed, so bypass the TTL schema cache
+                if self.pool is not None:
+                    schema_info = await self.schema_analyzer.extract_complete_schema_async(self.pool)
+                else:
+                    schema_info = self.schema_analyzer.extract_complete_schema(use_cache=False)
+                
+                # Enhance schema with relationship context, saved for NLToSQLGenerator
+                self.enhanced_schema_info = self.enhance_schema_context(schema_info)
+                save_enhanced_schema(self.enhanced_schema_info, SCHEMA_WRITER, fingerprint)
+            elif self.pool is not None:
+                # The fingerprint covers structure only; row counts change with data loads
+                await self.schema_analyzer.refresh_row_counts_async(self.pool, self.enhanced_schema_info)
+            else:
+                self.schema_analyzer.refresh_row_counts(self.enhanced_schema_info)
             
             # Get API key from environment
             api_key = os.getenv('ANTHROPIC_API_KEY')
@@ -134,29 +275,47 @@ class EnhancedInteractiveSQLGenerator:
                 return False
             
             # Initialize query generator with enhanced schema
-            self.query_generator = NLToSQLGenerator(schema_file, api_key)
+            # Cached SQL is only reused while the schema fingerprint matches the one it was generated for
+            self.query_generator = NLToSQLGenerator(
+                ENHANCED_SCHEMA_FILE, api_key, schema=self.enhanced_schema_info, schema_version=fingerprint
+            )
+            
+            print(f"📊 Schema loaded: {len(self.enhanced_schema_info['tables'])} tables with enhanced relationships")
             
-            print(f"📊 Schema loaded: {len(schema_info['tables'])} tables with enhanced relationships")
+            if PromptSession is not None:
+                self.prompt_session = self.create_prompt_session()
             return True
         except Exception as e:
             print(f"❌ Component initialization failed: {e}")
             return False
     
+    def create_prompt_session(self):
+        """Prompt with history recall and completion of commands, tables and table.column names"""
+        tables = self.enhanced_schema_info['tables']
+        vocabulary = [*self.commands, *EXIT_COMMANDS, *tables]
+        vocabulary.extend(f"{table}.{column['name']}" for table, meta in tables.items() for column in meta['columns'])
+        
+        os.makedirs(os.path.dirname(PROMPT_HISTORY_FILE), exist_ok=True)
+        return PromptSession(
+            history=FileHistory(PROMPT_HISTORY_FILE),
+            completer=SchemaCompleter(vocabulary)
+        )
+    
     def display_welcome(self):
         """Display enhanced welcome screen"""
-        print("\n" + "="*65)
+        print("\n" + SEP_EQ_65)
         print("🏦 SQL RAG Translator - Enhanced Interactive Mode")
-        print("="*65)
-        print(f"📅 Session started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(SEP_EQ_65)
+        print(f"📅 Session started: {datetime.now().strftime(DATETIME_FORMAT)}")
         print(f"🗄️  Database: {self.db_config['database']} (PostgreSQL)")
         print(f"🧠 Enhanced schema context with relationship paths")
         print("💡 Type 'help' for examples, 'quit' to exit")
-        print("-"*65)
+        print(SEP_DASH_65)
     
     def display_help(self):
         """Display enhanced help with better examples"""
         print("\n📚 Example Queries:")
-        print("=" * 50)
+        print(SEP_EQ_50)
         
         examples = [
             ("Customer Analysis", [
@@ -191,12 +350,12 @@ class EnhancedInteractiveSQLGenerator:
         print("- 'history' - Show query history") 
         print("- 'schema' - Show table relationships")
         print("- 'quit' or 'exit' - Exit the application")
-        print("-" * 50)
+        print(SEP_DASH_50)
     
     def display_schema_info(self):
         """Display key schema relationships"""
         print("\n📋 Key Table Relationships:")
-        print("=" * 40)
+        print(SEP_EQ_40)
         
         relationships = [
             "👥 Customers → Accounts → Transactions",
@@ -213,7 +372,7 @@ class EnhancedInteractiveSQLGenerator:
         print("  • Transactions connect to customers through accounts")
         print("  • Use accounts.current_balance for customer balances")
         print("  • Filter active employees with termination_date IS NULL")
-        print("-" * 40)
+        print(SEP_DASH_40)
     
     def display_history(self):
         """Display enhanced query history"""
@@ -222,111 +381,125 @@ class EnhancedInteractiveSQLGenerator:
             return
             
         print(f"\n📚 Query History ({len(self.session_queries)} queries):")
-        print("=" * 60)
-        for i, query_info in enumerate(self.session_queries, 1):
+        print(SEP_EQ_60)
+        for i, query_info in enumerate(self.session_queries.values(), 1):
             status_emoji = "✅" if query_info['status'] == "executed" else "📝" if query_info['status'] == "generated" else "❌"
             print(f"{i}. {status_emoji} {query_info['timestamp']} - {query_info['status'].upper()}")
             print(f"   Q: {query_info['question']}")
             if i < len(self.session_queries):
                 print()
     
-    def execute_query(self, sql_query):
+    async def execute_query(self, sql_query):
         """Execute SQL query with enhanced result formatting"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(sql_query)
+            # Server-side cursors stream only the previewed rows (both need a transaction);
+            # DML/DDL can't be declared as a cursor, so those run as plain statements
+            use_cursor = is_cursor_query(sql_query)
+            if self.pool is not None:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        if use_cursor:
+                            cursor = await conn.cursor(sql_query)
+                            results = await cursor.fetch(PREVIEW_ROWS + 1)
+                        else:
+                            results = await conn.fetch(sql_query)
+                # Records carry their column names, no cursor description needed
+                columns = list(results[0].keys()) if results else []
+            else:
+                if use_cursor:
+                    cursor = self.connection.cursor(name='query_preview')
+                    cursor.itersize = PREVIEW_ROWS + 1
+                    cursor.execute(sql_query)
+                    # A named cursor has no description until its first fetch
+                    results = cursor.fetchmany(PREVIEW_ROWS + 1)
+                else:
+                    cursor = self.connection.cursor()
+                    cursor.execute(sql_query)
+                    # Statements without a result set, e.g. plain INSERT, have no description
+                    results = cursor.fetchmany(PREVIEW_ROWS + 1) if cursor.description else []
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                cursor.close()
+                self.connection.commit()  # Commit successful queries
             
-            # Get results
-            results = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
+            more_rows = len(results) > PREVIEW_ROWS
+            results = results[:PREVIEW_ROWS]
             
             # Enhanced result display
             if results:
-                print(f"\n📊 Query Results ({len(results)} rows):")
-                print("=" * 70)
-                
-                # Calculate column widths for better formatting
-                col_widths = []
-                for i, col in enumerate(columns):
-                    max_width = len(col)
-                    for row in results[:10]:  # Check first 10 rows
-                        if row[i] is not None:
-                            max_width = max(max_width, len(str(row[i])))
-                    col_widths.append(min(max_width, 20))  # Cap at 20 chars
+                row_summary = f"first {PREVIEW_ROWS}" if more_rows else len(results)
+                lines = [f"\n📊 Query Results ({row_summary} rows):", SEP_EQ_70]
                 
-                # Header
-                header = " | ".join(col.ljust(width) for col, width in zip(columns, col_widths))
-                print(header)
-                print("-" * len(header))
+                # Header, rule and data rows (compiled with mypyc when built)
+                lines.extend(format_result_table(columns, results))
                 
-                # Data rows
-                for row in results[:10]:  # Limit to first 10 rows
-                    formatted_row = []
-                    for val, width in zip(row, col_widths):
-                        if val is None:
-                            formatted_val = "NULL".ljust(width)
-                        else:
-                            val_str = str(val)
-                            if len(val_str) > width:
-                                formatted_val = val_str[:width-3] + "..."
-                            else:
-                                formatted_val = val_str.ljust(width)
-                        formatted_row.append(formatted_val)
-                    print(" | ".join(formatted_row))
+                if more_rows:
+                    lines.append("\n... more rows available (re-run with LIMIT to see more)")
+                lines.append(SEP_EQ_70)
                 
-                if len(results) > 10:
-                    print(f"\n... and {len(results) - 10} more rows")
-                    
-                print("=" * 70)
+                # Emit the whole block in one write instead of a print per line
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
             else:
                 print("📋 Query executed successfully (no results returned)")
-                
-            cursor.close()
-            self.connection.commit()  # Commit successful queries
+            
             return True
             
         except Exception as e:
             print(f"❌ Query execution error: {e}")
-            self.connection.rollback()  # Rollback failed queries
+            if self.connection is not None:
+                self.connection.rollback()  # Rollback failed queries
             return False
     
-    def save_query(self, question, sql_query):
-        """Save query with enhanced metadata"""
+    def open_export_file(self):
+        """Open this session's export file and write its metadata header"""
+        EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        filename = EXPORTS_DIR / f"session_{datetime.now().strftime(FILE_TIMESTAMP_FORMAT)}.sql"
+        self.export_file = open(filename, 'a')
+        atexit.register(self.close_export_file)
+        
+        self.export_file.write(
+            f"-- SQL RAG Translator Export\n"
+            f"-- Generated by: Enhanced Interactive CLI v2.0\n"
+            f"-- Database: {self.db_config['database']} (PostgreSQL)\n"
+            f"-- Schema: 17 tables with enhanced relationship context\n\n"
+        )
+    
+    def close_export_file(self):
+        """Flush and close the session export (safe to call more than once)"""
+        if self.export_file is not None and not self.export_file.closed:
+            self.export_file.close()
+            print(f"💾 Saved queries written to: {self.export_file.name}")
+    
+    def save_query(self, question, sql_query, generated_at):
+        """Append query with enhanced metadata to the session export"""
         try:
-            # Create exports directory if it doesn't exist
-            exports_dir = Path("data/exports")
-            exports_dir.mkdir(parents=True, exist_ok=True)
+            if self.export_file is None:
+                self.open_export_file()
             
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = exports_dir / f"query_{timestamp}.sql"
-            
-            # Write query with enhanced metadata
-            with open(filename, 'w') as f:
-                f.write(f"-- SQL RAG Translator Export\n")
-                f.write(f"-- Generated by: Enhanced Interactive CLI v2.0\n")
-                f.write(f"-- Question: {question}\n")
-                f.write(f"-- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"-- Database: {self.db_config['database']} (PostgreSQL)\n")
-                f.write(f"-- Schema: 17 tables with enhanced relationship context\n\n")
-                f.write(sql_query)
-            
-            print(f"💾 Query saved to: {filename}")
+            self.export_file.write(
+                f"-- Question: {question}\n"
+                f"-- Generated: {generated_at.strftime(DATETIME_FORMAT)}\n"
+                f"{sql_query}\n\n"
+            )
+            self.export_file.flush()  # one record per prompt; don't lose it on a crash
+
+            print(f"💾 Query saved to: {self.export_file.name}")
             return True
             
         except Exception as e:
             print(f"❌ Save error: {e}")
             return False
     
-    def process_question(self, question):
+    async def process_question(self, question):
         """Process question with enhanced error handling and feedback"""
         print(f"\n🤖 Generating SQL query...")
         
         try:
             # Generate SQL using enhanced query generator
-            result = self.query_generator.generate_sql_query(question)
+            result = await asyncio.to_thread(self.query_generator.generate_sql_query, question)
             
             if result['success']:
+                generated_at = datetime.now()  # one timestamp for history and export
                 sql_query = result['sql_query']
                 # Try to get confidence from result, default to "Not available" if missing
                 confidence = result.get('confidence_score', result.get('confidence', 'Not available'))
@@ -336,16 +509,17 @@ class EnhancedInteractiveSQLGenerator:
                 else:
                     confidence_display = str(confidence)
                 
-                print(f"✅ Query generated successfully! (Confidence: {confidence_display})")
+                cached_label = " (cached)" if result.get('cached') else ""
+                print(f"✅ Query generated successfully!{cached_label} (Confidence: {confidence_display})")
                 print(f"\n📝 Generated SQL (PostgreSQL):")
-                print("=" * 50)
+                print(SEP_EQ_50)
                 print(sql_query)
-                print("=" * 50)
+                print(SEP_EQ_50)
                 
                 # Ask if user wants to execute
                 execute = input("\n⚡ Execute query? [Y/n]: ").strip().lower()
                 if execute in ['', 'y', 'yes']:
-                    success = self.execute_query(sql_query)
+                    success = await self.execute_query(sql_query)
                     status = "executed" if success else "failed"
                 else:
                     status = "generated"
@@ -353,16 +527,18 @@ class EnhancedInteractiveSQLGenerator:
                 # Ask if user wants to save
                 save = input("💾 Save query? [Y/n]: ").strip().lower()
                 if save in ['', 'y', 'yes']:
-                    self.save_query(question, sql_query)
+                    self.save_query(question, sql_query, generated_at)
                 
-                # Record in session history
-                self.session_queries.append({
-                    'timestamp': datetime.now().strftime('%H:%M:%S'),
+                # Record in session history; re-asking replaces the entry and moves it to the end
+                history_key = " ".join(question.lower().split())
+                self.session_queries[history_key] = {
+                    'timestamp': generated_at.strftime(TIME_FORMAT),
                     'question': question,
                     'sql': sql_query,
                     'status': status,
                     'confidence': confidence_display
-                })
+                }
+                self.session_queries.move_to_end(history_key)
                 
                 return True
                 
@@ -376,13 +552,13 @@ class EnhancedInteractiveSQLGenerator:
             print("💡 This might be a temporary issue. Please try again.")
             return False
     
-    def run(self):
+    async def run(self):
         """Enhanced main interactive loop"""
         # Initialize
-        if not self.connect_database():
+        if not await self.connect_database():
             return
             
-        if not self.initialize_components():
+        if not await self.initialize_components():
             return
         
         self.display_welcome()
@@ -391,28 +567,27 @@ class EnhancedInteractiveSQLGenerator:
         try:
             while True:
                 print()
-                question = input("💬 Enter your question: ").strip()
+                if self.prompt_session is not None:
+                    question = (await self.prompt_session.prompt_async("💬 Enter your question: ")).strip()
+                else:
+                    question = input("💬 Enter your question: ").strip()
                 
                 if not question:
                     continue
                     
                 # Handle commands
-                if question.lower() in ['quit', 'exit']:
+                command = question.lower()
+                if command in EXIT_COMMANDS:
                     print(f"\n👋 Session complete! Generated {len(self.session_queries)} queries.")
                     print("Thanks for using SQL RAG Translator!")
                     break
-                elif question.lower() == 'help':
-                    self.display_help()
-                    continue
-                elif question.lower() == 'history':
-                    self.display_history()
-                    continue
-                elif question.lower() == 'schema':
-                    self.display_schema_info()
+                handler = self.commands.get(command)
+                if handler is not None:
+                    handler()
                     continue
                 
                 # Process the question
-                self.process_question(question)
+                await self.process_question(question)
                 
         except KeyboardInterrupt:
             print(f"\n\n👋 Session interrupted. Generated {len(self.session_queries)} queries total.")
@@ -420,6 +595,10 @@ class EnhancedInteractiveSQLGenerator:
         except Exception as e:
             print(f"\n❌ Unexpected error: {e}")
         finally:
+            self.close_export_file()
+            if self.pool is not None:
+                await self.pool.close()
+                print("🔌 Database pool closed")
             if self.connection:
                 self.connection.close()
                 print("🔌 Database connection closed")
@@ -428,7 +607,7 @@ class EnhancedInteractiveSQLGenerator:
 def main():
     """Entry point"""
     generator = EnhancedInteractiveSQLGenerator()
-    generator.run()
+    asyncio.run(generator.run())
 
 
 if __name__ == "__main__":
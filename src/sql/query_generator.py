@@ -6,20 +6,71 @@ Converts user questions into database queries using schema context
 
 import json
 import os
-from typing import Dict, List, Any, Optional
+import re
+import atexit
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 from anthropic import Anthropic
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Semantic cache settings
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+SIMILARITY_THRESHOLD = 0.95
+DEFAULT_CACHE_PATH = 'data/cache/semantic_cache.npz'
+QUERY_CACHE_MAX_ENTRIES = 1000  # least recently used questions are evicted beyond this
+CACHE_SAVE_DELAY = 5.0  # seconds; stores arriving meanwhile share one write
+
+# Question tokens: numbers, comparison operators, then words
+QUESTION_TOKEN_PATTERN = re.compile(r'\d+(?:\.\d+)?|[<>]=?|!=|=|\w+')
+THOUSANDS_SEPARATOR_PATTERN = re.compile(r'(?<=\d),(?=\d{3}\b)')
+# Words that change a query's filter or ordering, so similar questions must agree on them
+COMPARISON_WORDS = frozenset((
+    'more', 'less', 'greater', 'fewer', 'above', 'below', 'over', 'under', 'least', 'most',
+    'top', 'bottom', 'highest', 'lowest', 'before', 'after', 'not', 'without'
+))
+
 class NLToSQLGenerator:
-    def __init__(self, schema_file_path: str, anthropic_api_key: str):
+    def __init__(self, schema_file_path: str, anthropic_api_key: str, cache_path: str = DEFAULT_CACHE_PATH,
+                 schema: Optional[Dict[str, Any]] = None, schema_version: Optional[str] = None):
         """Initialize with schema information and LLM client"""
         self.anthropic = Anthropic(api_key=anthropic_api_key)
-        self.schema = self.load_schema(schema_file_path)
+        # An already-parsed schema (same process) skips the round trip through disk
+        self.schema = schema if schema is not None else self.load_schema(schema_file_path)
         self.table_descriptions = self.load_table_descriptions()
+        
+        # Question cache: exact normalized matches first, then embedding similarity.
+        # Entries are only valid for the schema fingerprint they were generated against.
+        self.cache_path = cache_path
+        self.schema_version = schema_version or ''
+        self.cache_lock = threading.Lock()
+        self.query_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()  # least recently used first
+        self.embedding_cache: Dict[str, np.ndarray] = {}
+        self.embedding_model = None
+        self.save_pending = False
+        self.save_lock = threading.Lock()
+        self.load_query_cache()
+        atexit.register(self.flush_query_cache)
     
     def load_schema(self, schema_file_path: str) -> Dict[str, Any]:
         """Load schema information from JSON file"""
-        with open(schema_file_path, 'r') as f:
-            return json.load(f)
+        if orjson is None:
+            with open(schema_file_path, 'r') as f:
+                return json.load(f)
+        
+        # orjson parses the raw bytes directly, without a decoded str copy
+        with open(schema_file_path, 'rb') as f:
+            return orjson.loads(f.read())
     
     def load_table_descriptions(self) -> Dict[str, str]:
         """Load human-readable table descriptions"""
@@ -43,6 +94,130 @@ class NLToSQLGenerator:
             'transactions': 'Individual banking transactions with amounts and details'
         }
     
+    def load_query_cache(self):
+        """Load persisted question cache so restarts start warm"""
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            # Plain arrays and a JSON string only; nothing is unpickled
+            with np.load(self.cache_path, allow_pickle=False) as cached:
+                if cached['schema_version'].item() != self.schema_version:
+                    # Generated against another schema; the next save replaces the file
+                    print("ℹ️  Query cache was built for a different schema; starting empty")
+                    return
+                keys = cached['keys'].tolist()
+                results = json.loads(cached['results'].item())
+                embedding_keys = cached['embedding_keys'].tolist()
+                embeddings = cached['embeddings']
+            self.query_cache = OrderedDict(zip(keys, results))
+            self.embedding_cache = dict(zip(embedding_keys, embeddings))
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable query cache: {e}")
+    
+    def save_query_cache(self, query_cache: Dict[str, Dict[str, Any]], embedding_cache: Dict[str, np.ndarray]):
+        """Persist a snapshot of the question cache, swapped into place atomically"""
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                schema_version=np.array(self.schema_version),
+                keys=np.array(list(query_cache), dtype=str),
+                results=np.array(json.dumps(list(query_cache.values()))),
+                embedding_keys=np.array(list(embedding_cache), dtype=str),
+                embeddings=np.array(list(embedding_cache.values()), dtype=np.float32)
+            )
+        os.replace(tmp_path, self.cache_path)
+    
+    def schedule_cache_save(self):
+        """Persist the cache off the request path (caller holds cache_lock)"""
+        if self.save_pending:
+            return
+        self.save_pending = True
+        timer = threading.Timer(CACHE_SAVE_DELAY, self.flush_query_cache)
+        timer.daemon = True
+        timer.start()
+    
+    def flush_query_cache(self):
+        """Write pending cache changes now (also run at exit)"""
+        with self.save_lock:
+            with self.cache_lock:
+                if not self.save_pending:
+                    return
+                self.save_pending = False
+                query_cache, embedding_cache = dict(self.query_cache), dict(self.embedding_cache)
+            try:
+                self.save_query_cache(query_cache, embedding_cache)
+            except OSError as e:
+                print(f"⚠️  Could not persist query cache: {e}")
+    
+    def normalize_question(self, user_question: str) -> str:
+        """Lowercase and drop punctuation, keeping numbers and comparison operators as tokens"""
+        question = THOUSANDS_SEPARATOR_PATTERN.sub('', user_question.lower())
+        return ' '.join(QUESTION_TOKEN_PATTERN.findall(question))
+    
+    def question_constraints(self, normalized_question: str) -> Tuple[str, ...]:
+        """Numbers, operators and comparison words, in order; a semantic hit must match these exactly"""
+        return tuple(
+            token for token in normalized_question.split()
+            if token[0].isdigit() or token[0] in '<>=!' or token in COMPARISON_WORDS
+        )
+    
+    def embed_question(self, question: str) -> Optional[np.ndarray]:
+        """Embed a normalized question, or None if no embedding model is available"""
+        if SentenceTransformer is None:
+            return None
+        if self.embedding_model is None:
+            self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        return self.embedding_model.encode(question, normalize_embeddings=True)
+    
+    def lookup_cached_query(self, cache_key: str, embedding: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Find a cached result by exact key, then by cosine similarity within the same dialect"""
+        with self.cache_lock:
+            if cache_key in self.query_cache:
+                self.query_cache.move_to_end(cache_key)
+                return self.query_cache[cache_key]
+            if embedding is None:
+                return None
+            
+            dialect, question = cache_key.split(':', 1)
+            constraints = self.question_constraints(question)
+            best_key, best_score = None, SIMILARITY_THRESHOLD
+            for key, cached_embedding in self.embedding_cache.items():
+                if not key.startswith(dialect + ':'):
+                    continue
+                # "top 5" and "top 10" embed almost identically but need different SQL
+                if self.question_constraints(key.split(':', 1)[1]) != constraints:
+                    continue
+                # Embeddings are unit length, so the dot product is the cosine similarity
+                score = float(np.dot(cached_embedding, embedding))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            
+            if best_key is None:
+                return None
+            self.query_cache.move_to_end(best_key)
+            return self.query_cache[best_key]
+    
+    def store_cached_query(self, cache_key: str, embedding: Optional[np.ndarray], result: Dict[str, Any]):
+        """Add a successful result to the cache, evicting the least recently used beyond the cap"""
+        with self.cache_lock:
+            self.query_cache[cache_key] = result
+            self.query_cache.move_to_end(cache_key)
+            if embedding is not None:
+                self.embedding_cache[cache_key] = embedding
+            while len(self.query_cache) > QUERY_CACHE_MAX_ENTRIES:
+                evicted_key, _ = self.query_cache.popitem(last=False)
+                self.embedding_cache.pop(evicted_key, None)
+            self.schedule_cache_save()
+    
+    def clear_query_cache(self):
+        """Forget all cached questions, e.g. after the schema changes"""
+        with self.cache_lock:
+            self.query_cache = OrderedDict()
+            self.embedding_cache = {}
+            self.schedule_cache_save()
+    
     def identify_relevant_tables(self, user_question: str) -> List[str]:
         """Identify which tables are most relevant to the user's question"""
         question_lower = user_question.lower()
@@ -151,6 +326,19 @@ class NLToSQLGenerator:
     def generate_sql_query(self, user_question: str, target_dialect: str = 'postgresql') -> Dict[str, Any]:
         """Generate SQL query from natural language question"""
         
+        # Serve repeated or near-duplicate questions from cache
+        cache_key = f"{target_dialect}:{self.normalize_question(user_question)}"
+        embedding = None
+        cached_result = self.lookup_cached_query(cache_key, None)
+        if cached_result is None:
+            try:
+                embedding = self.embed_question(cache_key.split(':', 1)[1])
+            except Exception as e:
+                print(f"⚠️  Semantic cache disabled: {e}")
+            cached_result = self.lookup_cached_query(cache_key, embedding)
+        if cached_result is not None:
+            return dict(cached_result, cached=True)
+        
         # Identify relevant tables
         relevant_tables = self.identify_relevant_tables(user_question)
         
@@ -174,7 +362,7 @@ class NLToSQLGenerator:
             # Parse the response to extract SQL and explanation
             parsed_response = self.parse_sql_response(sql_response)
             
-            return {
+            result = {
                 'success': True,
                 'sql_query': parsed_response['sql'],
                 'explanation': parsed_response['explanation'],
@@ -183,6 +371,9 @@ class NLToSQLGenerator:
                 'confidence': parsed_response.get('confidence', 'medium')
             }
             
+            self.store_cached_query(cache_key, embedding, result)
+            return dict(result)
+            
         except Exception as e:
             return {
                 'success': False,
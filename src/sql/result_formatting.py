@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Result Preview Formatting
+Renders query result rows as fixed-width text for the interactive CLI
+
+Plain, fully annotated Python so it can be compiled with mypyc
+(`mypyc src/sql/result_formatting.py`); the compiled extension module
+takes precedence over this file on import.
+"""
+
+from typing import Any, List, Sequence
+
+MAX_COLUMN_WIDTH = 20
+
+
+def format_result_table(columns: List[str], rows: Sequence[Sequence[Any]],
+                        max_width: int = MAX_COLUMN_WIDTH) -> List[str]:
+    """Header, rule and one line per row; NULLs shown, long values cut with '...'"""
+    # Stringify each cell once; widths come from the transposed columns
+    cells: List[List[str]] = [["NULL" if val is None else str(val) for val in row] for row in rows]
+    widths: List[int] = [
+        min(max(len(col), max(map(len, values))), max_width)
+        for col, values in zip(columns, zip(*cells))
+    ]
+
+    header = " | ".join(col.ljust(width) for col, width in zip(columns, widths))
+    lines: List[str] = [header, "-" * len(header)]
+
+    # One format spec pads every cell; long values get an ellipsis first
+    row_format = " | ".join(f"{{:<{width}.{width}}}" for width in widths)
+    for row in cells:
+        lines.append(row_format.format(*[
+            val_str if len(val_str) <= width else val_str[:width-3] + "..."
+            for val_str, width in zip(row, widths)
+        ]))
+
+    return lines